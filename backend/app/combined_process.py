@@ -88,7 +88,7 @@ client_openai = OpenAI(api_key=OPENAI_API_KEY)
 enc = tiktoken.encoding_for_model(AI_MODEL)
 
 # Import services
-from app.services.database_service import db_service
+from app.services.database_service import get_db_service
 from app.services.email_service import email_service
 
 # Define a URL normalizer function
@@ -110,6 +110,72 @@ for line in __doc__.splitlines():
         SCRIPT_VERSION = line.split("Version:")[1].strip()
         break
 
+# ISO-datumformaat, tevens het formaat waarin datums worden opgeslagen
+ISO_DATE_FORMAT = '%Y-%m-%d'
+
+# Numerieke datumformaten, geïndexeerd op (lengte, positie scheidingsteken, scheidingsteken)
+NUMERIC_DATE_FORMATS = {
+    (10, 2, '-'): '%d-%m-%Y',       # 14-03-2025
+    (10, 2, '/'): '%d/%m/%Y',       # 14/03/2025
+    (10, 4, '-'): ISO_DATE_FORMAT,  # 2025-03-14
+}
+
+# Alle ondersteunde datumformaten, in volgorde van proberen
+DATE_FORMATS = (
+    '%d-%m-%Y',     # 14-03-2025
+    '%d/%m/%Y',     # 14/03/2025
+    ISO_DATE_FORMAT,  # 2025-03-14
+    '%B %d, %Y',    # March 14, 2025
+    '%d %B %Y',     # 14 March 2025
+    '%d %b %Y'      # 14 Mar 2025
+)
+
+def parse_date(value):
+    """Convert a date string to the standard format or return None if invalid."""
+    if not value:
+        return None
+    
+    # Clean the input
+    value = value.strip()
+    
+    try:
+        # Fast path: zero-padded numeric dates are identified by their separator,
+        # so only the one matching format has to be tried
+        fmt = None
+        if len(value) == 10:
+            fmt = (NUMERIC_DATE_FORMATS.get((10, 2, value[2])) or
+                   NUMERIC_DATE_FORMATS.get((10, 4, value[4])))
+        formats = (fmt,) if fmt else DATE_FORMATS
+        
+        # ISO dates are already in the target format; date.fromisoformat parses
+        # them in C without going through the strptime format interpreter
+        if fmt == ISO_DATE_FORMAT:
+            try:
+                formatted_date = datetime.date.fromisoformat(value).isoformat()
+                logging.info(f"Successfully parsed date '{value}' to '{formatted_date}'")
+                return formatted_date
+            except ValueError:
+                # strptime rejects the same values, no need to try it as well
+                logging.warning(f"Couldn't parse date: '{value}'")
+                return None
+        
+        for fmt in formats:
+            try:
+                date_obj = datetime.datetime.strptime(value, fmt)
+                # Always return in PostgreSQL-compatible format
+                formatted_date = date_obj.date().isoformat()
+                logging.info(f"Successfully parsed date '{value}' to '{formatted_date}'")
+                return formatted_date
+            except ValueError:
+                continue
+        
+        # If we can't parse the date, return None instead of the raw string
+        logging.warning(f"Couldn't parse date: '{value}'")
+        return None
+    except Exception as e:
+        logging.error(f"Error parsing date: {value} - {str(e)}")
+        return None
+
 # HTML naar Markdown converter
 def convert_html_to_markdown(html_text):
     """Convert HTML to Markdown while preserving the formatting."""
@@ -258,16 +324,18 @@ def extract_data_from_html(html, url):
     progress_logger.info(f"Found job description: {'Yes' if functieomschrijving else 'No'}, length: {len(str(functieomschrijving)) if functieomschrijving else 0}")
     progress_logger.info(f"Found info fields: {list(aanvraag_info.keys())}")
     
-    # Build markdown output
-    markdown_output = "## Aanvraag Informatie\n"
-    markdown_output += f"- [🔗 Aanvraag Link]({url})\n"
-    markdown_output += "- **Functie:** " + (functie.get_text(strip=True) if functie else "Onbekend") + "\n"
-    markdown_output += "- **Klant:** " + (klant.get_text(strip=True) if klant else "Onbekend") + "\n"
+    # Build markdown output; collect the lines and join them once at the end
+    markdown_parts = [
+        "## Aanvraag Informatie\n",
+        f"- [🔗 Aanvraag Link]({url})\n",
+        "- **Functie:** " + (functie.get_text(strip=True) if functie else "Onbekend") + "\n",
+        "- **Klant:** " + (klant.get_text(strip=True) if klant else "Onbekend") + "\n",
+    ]
     
     for key, value in aanvraag_info.items():
         if key == "Uren":
             value = value.replace("onbekend", "").strip()
-        markdown_output += f"- **{key}:** {value}\n"
+        markdown_parts.append(f"- **{key}:** {value}\n")
 
     if functieomschrijving:
         # Get the entire HTML of the function description
@@ -279,9 +347,9 @@ def extract_data_from_html(html, url):
     # Convert HTML to Markdown
     markdown_functieomschrijving = convert_html_to_markdown(functieomschrijving_html)
 
-    markdown_output += "\n## Functieomschrijving\n" + markdown_functieomschrijving + "\n\n"
+    markdown_parts.append("\n## Functieomschrijving\n" + markdown_functieomschrijving + "\n\n")
 
-    return markdown_output
+    return "".join(markdown_parts)
 
 def check_environment_variables():
     """Checks if all required configuration variables are set."""
@@ -1042,45 +1110,6 @@ async def spider_vacatures():
             progress_logger.info(f"Succesvol gecrawled: {crawler_url}")
             markdown_data = extract_data_from_html(result.html, db_url)
             
-            # Function to parse dates into standard format
-            def parse_date(value):
-                """Convert a date string to the standard format or return None if invalid."""
-                import datetime as dt  # Import locally to ensure availability
-                
-                if not value:
-                    return None
-                
-                # Clean the input
-                value = value.strip()
-                
-                try:
-                    # Try different date formats
-                    formats = [
-                        '%d-%m-%Y',     # 14-03-2025
-                        '%d/%m/%Y',     # 14/03/2025
-                        '%Y-%m-%d',     # 2025-03-14
-                        '%B %d, %Y',    # March 14, 2025
-                        '%d %B %Y',     # 14 March 2025
-                        '%d %b %Y'      # 14 Mar 2025
-                    ]
-                    
-                    for fmt in formats:
-                        try:
-                            date_obj = dt.datetime.strptime(value, fmt)
-                            # Always return in PostgreSQL-compatible format
-                            formatted_date = date_obj.strftime('%Y-%m-%d')
-                            logging.info(f"Successfully parsed date '{value}' to '{formatted_date}'")
-                            return formatted_date
-                        except ValueError:
-                            continue
-                    
-                    # If we can't parse the date, return None instead of the raw string
-                    logging.warning(f"Couldn't parse date: '{value}'")
-                    return None
-                except Exception as e:
-                    logging.error(f"Error parsing date: {value} - {str(e)}")
-                    return None
-            
             # Function to parse markdown data into structured format
             def parse_markdown_data(markdown, url):
                 """Parse Markdown data into a structured dictionary"""
@@ -1160,57 +1189,45 @@ async def spider_vacatures():
                     conn = get_connection()
                     cursor = conn.cursor()
                     
-                    # Check if vacancy already exists
-                    cursor.execute("SELECT id FROM vacancies WHERE url = %s", (db_url,))
-                    existing = cursor.fetchone()
-                    
-                    if existing:
-                        # Update existing record
-                        cursor.execute(
-                            """
-                            UPDATE vacancies 
-                            SET status = 'AI afgewezen',
-                                checked_resumes = '',
-                                top_match = 0,
-                                match_toelichting = %s,
-                                updated_at = NOW()
-                            WHERE url = %s
-                            """,
-                            (json.dumps({"reason": "Klant staat op de uitsluitlijst"}), db_url)
+                    # Insert the vacancy, or mark the existing one, in a single
+                    # statement instead of a lookup followed by an INSERT or UPDATE
+                    cursor.execute(
+                        """
+                        INSERT INTO vacancies (
+                            url, functie, klant, functieomschrijving, status,
+                            branche, regio, uren, tarief, 
+                            checked_resumes, top_match, match_toelichting,
+                            model, version, created_at, updated_at
+                        ) VALUES (
+                            %s, %s, %s, %s, %s,
+                            %s, %s, %s, %s,
+                            %s, %s, %s,
+                            %s, %s, NOW(), NOW()
                         )
-                    else:
-                        # Insert new record
-                        cursor.execute(
-                            """
-                            INSERT INTO vacancies (
-                                url, functie, klant, functieomschrijving, status,
-                                branche, regio, uren, tarief, 
-                                checked_resumes, top_match, match_toelichting,
-                                model, version, created_at, updated_at
-                            ) VALUES (
-                                %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s,
-                                %s, %s, %s,
-                                %s, %s, NOW(), NOW()
-                            )
-                            """,
-                            (
-                                db_url,
-                                vacancy_data.get("Functie", ""),
-                                vacancy_data.get("Klant", ""),
-                                vacancy_data.get("Functieomschrijving", ""),
-                                "AI afgewezen",
-                                vacancy_data.get("Branche", ""),
-                                vacancy_data.get("Regio", ""),
-                                vacancy_data.get("Uren", ""),
-                                vacancy_data.get("Tarief", ""),
-                                "",
-                                0,
-                                json.dumps({"reason": "Klant staat op de uitsluitlijst"}),
-                                vacancy_data.get("Model", ""),
-                                vacancy_data.get("Version", "")
-                            )
+                        ON CONFLICT (url) DO UPDATE
+                        SET status = EXCLUDED.status,
+                            checked_resumes = EXCLUDED.checked_resumes,
+                            top_match = EXCLUDED.top_match,
+                            match_toelichting = EXCLUDED.match_toelichting,
+                            updated_at = NOW()
+                        """,
+                        (
+                            db_url,
+                            vacancy_data.get("Functie", ""),
+                            vacancy_data.get("Klant", ""),
+                            vacancy_data.get("Functieomschrijving", ""),
+                            "AI afgewezen",
+                            vacancy_data.get("Branche", ""),
+                            vacancy_data.get("Regio", ""),
+                            vacancy_data.get("Uren", ""),
+                            vacancy_data.get("Tarief", ""),
+                            "",
+                            0,
+                            json.dumps({"reason": "Klant staat op de uitsluitlijst"}),
+                            vacancy_data.get("Model", ""),
+                            vacancy_data.get("Version", "")
                         )
+                    )
                     
                     conn.commit()
                     cursor.close()
@@ -1236,52 +1253,40 @@ async def spider_vacatures():
                     pg_conn = get_connection()
                     pg_cursor = pg_conn.cursor()
                     
-                    # Check if vacancy already exists
-                    pg_cursor.execute("SELECT id FROM vacancies WHERE url = %s", (db_url,))
-                    existing = pg_cursor.fetchone()
-                    
-                    if existing:
-                        # Update existing record
-                        pg_cursor.execute(
-                            """
-                            UPDATE vacancies 
-                            SET status = 'AI afgewezen',
-                                checked_resumes = '',
-                                top_match = 0,
-                                match_toelichting = %s,
-                                updated_at = NOW()
-                            WHERE url = %s
-                            """,
-                            (json.dumps({"reason": "Geen functiebeschrijving gevonden"}), db_url)
+                    # Insert the vacancy with AI afgewezen status, or mark the
+                    # existing one, in a single statement
+                    pg_cursor.execute(
+                        """
+                        INSERT INTO vacancies (
+                            url, functie, klant, status, branche, regio, uren, tarief, 
+                            checked_resumes, top_match, match_toelichting, model, version,
+                            created_at, updated_at
+                        ) VALUES (
+                            %s, %s, %s, %s, %s, %s, %s, %s,
+                            '', 0, %s, %s, %s,
+                            NOW(), NOW()
                         )
-                    else:
-                        # Insert new record with AI afgewezen status
-                        pg_cursor.execute(
-                            """
-                            INSERT INTO vacancies (
-                                url, functie, klant, status, branche, regio, uren, tarief, 
-                                checked_resumes, top_match, match_toelichting, model, version,
-                                created_at, updated_at
-                            ) VALUES (
-                                %s, %s, %s, %s, %s, %s, %s, %s,
-                                '', 0, %s, %s, %s,
-                                NOW(), NOW()
-                            )
-                            """,
-                            (
-                                db_url,
-                                vacancy_data.get("Functie", ""),
-                                vacancy_data.get("Klant", ""),
-                                "AI afgewezen",
-                                vacancy_data.get("Branche", ""),
-                                vacancy_data.get("Regio", ""),
-                                vacancy_data.get("Uren", ""),
-                                vacancy_data.get("Tarief", ""),
-                                json.dumps({"reason": "Geen functiebeschrijving gevonden"}),
-                                vacancy_data.get("Model", ""),
-                                vacancy_data.get("Version", "")
-                            )
+                        ON CONFLICT (url) DO UPDATE
+                        SET status = EXCLUDED.status,
+                            checked_resumes = EXCLUDED.checked_resumes,
+                            top_match = EXCLUDED.top_match,
+                            match_toelichting = EXCLUDED.match_toelichting,
+                            updated_at = NOW()
+                        """,
+                        (
+                            db_url,
+                            vacancy_data.get("Functie", ""),
+                            vacancy_data.get("Klant", ""),
+                            "AI afgewezen",
+                            vacancy_data.get("Branche", ""),
+                            vacancy_data.get("Regio", ""),
+                            vacancy_data.get("Uren", ""),
+                            vacancy_data.get("Tarief", ""),
+                            json.dumps({"reason": "Geen functiebeschrijving gevonden"}),
+                            vacancy_data.get("Model", ""),
+                            vacancy_data.get("Version", "")
                         )
+                    )
                     
                     pg_conn.commit()
                     pg_cursor.close()
@@ -1311,99 +1316,81 @@ async def spider_vacatures():
                 conn = get_connection()
                 cursor = conn.cursor()
                 
-                # Check if vacancy already exists in PostgreSQL
-                cursor.execute(
-                    """
-                    SELECT id FROM vacancies WHERE url = %s
-                    """,
-                    (db_url,)
-                )
-                existing_vacancy = cursor.fetchone()
-                
-                if existing_vacancy:
-                    # Update existing vacancy
-                    vacancy_id = existing_vacancy[0]
-                    progress_logger.info(f"Updating existing vacancy in PostgreSQL (ID: {vacancy_id})")
+                # Insert the vacancy, or update the existing one with the same URL,
+                # in a single statement instead of looking it up first
+                progress_logger.info(f"Saving vacancy to PostgreSQL")
+                try:
+                    # Log the date values for debugging
+                    progress_logger.info(f"Date values - Geplaatst: {vacancy_data.get('Geplaatst')}, Sluiting: {vacancy_data.get('Sluiting')}")
+                    
+                    # Get all columns from vacancy_data that might need to be inserted
                     cursor.execute(
                         """
-                        UPDATE vacancies 
-                        SET functie = %s, 
-                            klant = %s, 
-                            functieomschrijving = %s, 
-                            status = %s,
+                        INSERT INTO vacancies (
+                            url, functie, klant, functieomschrijving, status, 
+                            branche, regio, uren, tarief, checked_resumes, 
+                            geplaatst, sluiting, external_id, model, version,
+                            created_at, updated_at
+                        ) 
+                        VALUES (
+                            %s, %s, %s, %s, %s, 
+                            %s, %s, %s, %s, %s, 
+                            %s, %s, %s, %s, %s,
+                            NOW(), NOW()
+                        )
+                        ON CONFLICT (url) DO UPDATE
+                        SET functie = EXCLUDED.functie, 
+                            klant = EXCLUDED.klant, 
+                            functieomschrijving = EXCLUDED.functieomschrijving, 
+                            status = EXCLUDED.status,
                             updated_at = NOW()
-                        WHERE id = %s
+                        RETURNING id
                         """,
                         (
+                            db_url,
                             vacancy_data.get("Functie", ""),
                             vacancy_data.get("Klant", ""),
                             vacancy_data.get("Functieomschrijving", ""),
                             vacancy_data.get("Status", "Nieuw"),
-                            vacancy_id
+                            vacancy_data.get("Branche", ""),
+                            vacancy_data.get("Regio", ""),
+                            vacancy_data.get("Uren", ""),
+                            vacancy_data.get("Tarief", ""),
+                            vacancy_data.get("Checked_resumes", ""),
+                            vacancy_data.get("Geplaatst"),  # Date may be None if parsing failed
+                            vacancy_data.get("Sluiting"),  # Date may be None if parsing failed
+                            vacancy_data.get("External_id", ""),
+                            vacancy_data.get("Model", ""),
+                            vacancy_data.get("Version", "")
                         )
                     )
-                else:
-                    # Insert new vacancy
-                    progress_logger.info(f"Inserting new vacancy into PostgreSQL")
-                    try:
-                        # Log the date values for debugging
-                        progress_logger.info(f"Date values - Geplaatst: {vacancy_data.get('Geplaatst')}, Sluiting: {vacancy_data.get('Sluiting')}")
-                        
-                        # Get all columns from vacancy_data that might need to be inserted
-                        cursor.execute(
-                            """
-                            INSERT INTO vacancies (
-                                url, functie, klant, functieomschrijving, status, 
-                                branche, regio, uren, tarief, checked_resumes, 
-                                geplaatst, sluiting, external_id, model, version,
-                                created_at, updated_at
-                            ) 
-                            VALUES (
-                                %s, %s, %s, %s, %s, 
-                                %s, %s, %s, %s, %s, 
-                                %s, %s, %s, %s, %s,
-                                NOW(), NOW()
-                            )
-                            RETURNING id
-                            """,
-                            (
-                                db_url,
-                                vacancy_data.get("Functie", ""),
-                                vacancy_data.get("Klant", ""),
-                                vacancy_data.get("Functieomschrijving", ""),
-                                vacancy_data.get("Status", "Nieuw"),
-                                vacancy_data.get("Branche", ""),
-                                vacancy_data.get("Regio", ""),
-                                vacancy_data.get("Uren", ""),
-                                vacancy_data.get("Tarief", ""),
-                                vacancy_data.get("Checked_resumes", ""),
-                                vacancy_data.get("Geplaatst"),  # Date may be None if parsing failed
-                                vacancy_data.get("Sluiting"),  # Date may be None if parsing failed
-                                vacancy_data.get("External_id", ""),
-                                vacancy_data.get("Model", ""),
-                                vacancy_data.get("Version", "")
-                            )
-                        )
-                    except Exception as insert_error:
-                        progress_logger.error(f"Error in full insert, trying minimal insert: {str(insert_error)}")
-                        # Fallback to minimal insert if the full insert fails
-                        cursor.execute(
-                            """
-                            INSERT INTO vacancies (url, functie, klant, functieomschrijving, status, geplaatst, sluiting, created_at, updated_at) 
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
-                            RETURNING id
-                            """,
-                            (
-                                db_url,
-                                vacancy_data.get("Functie", ""),
-                                vacancy_data.get("Klant", ""),
-                                vacancy_data.get("Functieomschrijving", ""),
-                                vacancy_data.get("Status", "Nieuw"),
-                                vacancy_data.get("Geplaatst"),
-                                vacancy_data.get("Sluiting")
-                            )
+                except Exception as insert_error:
+                    progress_logger.error(f"Error in full insert, trying minimal insert: {str(insert_error)}")
+                    # Fallback to minimal insert if the full insert fails
+                    conn.rollback()
+                    cursor.execute(
+                        """
+                        INSERT INTO vacancies (url, functie, klant, functieomschrijving, status, geplaatst, sluiting, created_at, updated_at) 
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
+                        ON CONFLICT (url) DO UPDATE
+                        SET functie = EXCLUDED.functie, 
+                            klant = EXCLUDED.klant, 
+                            functieomschrijving = EXCLUDED.functieomschrijving, 
+                            status = EXCLUDED.status,
+                            updated_at = NOW()
+                        RETURNING id
+                        """,
+                        (
+                            db_url,
+                            vacancy_data.get("Functie", ""),
+                            vacancy_data.get("Klant", ""),
+                            vacancy_data.get("Functieomschrijving", ""),
+                            vacancy_data.get("Status", "Nieuw"),
+                            vacancy_data.get("Geplaatst"),
+                            vacancy_data.get("Sluiting")
                         )
-                    vacancy_id = cursor.fetchone()[0]
+                    )
+                vacancy_id = cursor.fetchone()[0]
                 
                 # Commit the transaction
                 conn.commit()
@@ -1419,7 +1406,7 @@ async def spider_vacatures():
             
             try:
                 # Get matches using the database service
-                query_data = db_service.get_vector_matches(
+                query_data = await get_db_service().get_vector_matches_async(
                     embedding=vacancy_embedding,
                     threshold=MATCH_THRESHOLD,
                     count=MATCH_COUNT
@@ -1649,7 +1636,7 @@ async def spider_vacatures():
             
             # Send email digest if we have any data
             if email_vacancy_data:
-                email_sent = email_service.send_digest(email_vacancy_data, processing_stats)
+                email_sent = await email_service.send_digest_async(email_vacancy_data, processing_stats)
                 if email_sent:
                     progress_logger.info("✅ Email digest sent successfully")
                 else:
@@ -1847,6 +1834,40 @@ async def process_existing_new_vacancies():
         
         if not new_vacancies:
             return
+        
+        # Vacancies without a description can't be matched; mark them all as
+        # AI afgewezen in one UPDATE instead of one statement and commit each
+        rejected_ids = [vacancy['id'] for vacancy in new_vacancies if not vacancy['functieomschrijving']]
+        if rejected_ids:
+            progress_logger.warning(f"⚠️ Geen functiebeschrijving gevonden voor {len(rejected_ids)} vacatures, markeren als 'AI afgewezen'.")
+            try:
+                conn = get_connection()
+                cursor = conn.cursor()
+                
+                cursor.execute(
+                    """
+                    UPDATE vacancies 
+                    SET status = 'AI afgewezen',
+                        checked_resumes = '',
+                        top_match = 0,
+                        match_toelichting = %s,
+                        updated_at = NOW()
+                    WHERE id = ANY(%s)
+                    """,
+                    (json.dumps({"reason": "Geen functiebeschrijving gevonden"}), rejected_ids)
+                )
+                
+                conn.commit()
+                cursor.close()
+                conn.close()
+                progress_logger.info(f"✅ {len(rejected_ids)} vacancies without function description marked as AI afgewezen in PostgreSQL")
+            except Exception as pg_error:
+                progress_logger.error(f"❌ Error saving rejection status for vacancies without description: {str(pg_error)}")
+                if 'conn' in locals() and conn:
+                    conn.rollback()
+                    conn.close()
+            
+            new_vacancies = [vacancy for vacancy in new_vacancies if vacancy['functieomschrijving']]
             
         # Process each vacancy
         for i, vacancy in enumerate(new_vacancies):
@@ -1857,41 +1878,7 @@ async def process_existing_new_vacancies():
             progress_logger.info(f"\n=== Processing existing vacancy {i+1}/{len(new_vacancies)} ===")
             progress_logger.info(f"Vacancy ID: {vacancy_id}, URL: {db_url}")
             
-            # Check if vacancy has a description
             vacancy_text = vacancy_data.get("functieomschrijving", "")
-            if not vacancy_text:
-                progress_logger.warning(f"⚠️ Geen functiebeschrijving gevonden voor {db_url}, markeren als 'AI afgewezen'.")
-                
-                # Update PostgreSQL with rejection status
-                try:
-                    conn = get_connection()
-                    cursor = conn.cursor()
-                    
-                    cursor.execute(
-                        """
-                        UPDATE vacancies 
-                        SET status = 'AI afgewezen',
-                            checked_resumes = '',
-                            top_match = 0,
-                            match_toelichting = %s,
-                            updated_at = NOW()
-                        WHERE id = %s
-                        """,
-                        (json.dumps({"reason": "Geen functiebeschrijving gevonden"}), vacancy_id)
-                    )
-                    
-                    conn.commit()
-                    cursor.close()
-                    conn.close()
-                    progress_logger.info(f"✅ Vacancy without function description marked as AI afgewezen in PostgreSQL")
-                except Exception as pg_error:
-                    progress_logger.error(f"❌ Error saving rejection status for vacancy without description: {str(pg_error)}")
-                    if 'conn' in locals() and conn:
-                        conn.rollback()
-                        conn.close()
-                
-                # Skip to the next vacancy
-                continue
             
             # Prepare vacancy for embedding
             try:
@@ -123,7 +123,7 @@ class SchedulerConfig(BaseModel):
 class EmailConfig(BaseModel):
     """Email notification configuration."""
     enabled: bool = Field(default=False, description="Enable email notifications")
-    provider: str = Field(default="smtp", description="Email provider (smtp, gmail, mailersend)")
+    provider: str = Field(default="smtp", description="Email provider (smtp, gmail, mailersend, dryrun)")
     smtp_host: str = Field(default="smtp.example.com", description="SMTP server hostname")
     smtp_port: int = Field(default=587, description="SMTP server port")
     smtp_use_tls: bool = Field(default=True, description="Use TLS for SMTP connection")
@@ -138,7 +138,7 @@ class EmailConfig(BaseModel):
     @classmethod
     def validate_provider(cls, v: str) -> str:
         """Validate email provider."""
-        valid_providers = ["smtp", "gmail", "mailersend"]
+        valid_providers = ["smtp", "gmail", "mailersend", "dryrun"]
         if v.lower() not in valid_providers:
             raise ValueError(f"Invalid provider: {v}. Must be one of {valid_providers}")
         return v.lower()
@@ -51,6 +51,14 @@ if PG_HOST == "db" and not os.path.exists("/.dockerenv"):
     PG_HOST = "localhost"
     logger.warning(f"Detected non-Docker environment, overriding PG_HOST to {PG_HOST}")
 
+# Embedding indexes on the resumes table: the half precision one on pgvector
+# 0.7+, the full precision one before that. A rebuild may use this much memory
+# to build the graph in one pass instead of spilling to disk.
+HALFVEC_INDEX_NAME = "idx_resumes_embedding_halfvec"
+HNSW_INDEX_NAME = "idx_resumes_embedding_hnsw"
+EMBEDDING_INDEX_NAMES = (HALFVEC_INDEX_NAME, HNSW_INDEX_NAME)
+INDEX_MAINTENANCE_WORK_MEM = os.getenv("PG_INDEX_MAINTENANCE_WORK_MEM", "1GB")
+
 def get_connection():
     """Get a PostgreSQL connection"""
     # Determine if we're running in Docker or local environment
@@ -189,6 +197,101 @@ def initialize_database():
         """)
         logger.info("✅ Created resumes table")
         
+        # Index the filename, which resumes are looked up, replaced and deleted
+        # by, so those don't scan every chunk
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_resumes_filename
+            ON public.resumes (filename)
+        """)
+        logger.info("✅ Created resumes filename index")
+        
+        # Index the embeddings for approximate nearest-neighbour search, so a
+        # match walks an HNSW graph instead of comparing against every chunk.
+        # HNSW needs pgvector 0.5+; on older versions matching keeps working
+        # as an exact scan. From pgvector 0.7 the index stores the embeddings
+        # as half precision, half the size to build, cache and read; the
+        # column keeps full precision, which matches use to rank the results.
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        pgvector_version = tuple(int(part) for part in cursor.fetchone()[0].split(".")[:2])
+        cursor.execute("SAVEPOINT resumes_embedding_index")
+        try:
+            if pgvector_version >= (0, 7):
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS {HALFVEC_INDEX_NAME}
+                    ON public.resumes USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+                """)
+                cursor.execute(f"DROP INDEX IF EXISTS public.{HNSW_INDEX_NAME}")
+            else:
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS {HNSW_INDEX_NAME}
+                    ON public.resumes USING hnsw (embedding vector_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+                """)
+            cursor.execute("RELEASE SAVEPOINT resumes_embedding_index")
+            logger.info("✅ Created resumes embedding index")
+        except psycopg2.Error as index_error:
+            cursor.execute("ROLLBACK TO SAVEPOINT resumes_embedding_index")
+            logger.warning(f"⚠️ Could not create HNSW embedding index, matches will scan all resumes: {str(index_error)}")
+        
+        # Create resumes_meta table with one row per candidate resume, so listing
+        # and counting candidates doesn't have to scan every chunk
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS public.resumes_meta (
+                name text NOT NULL,
+                filename text NOT NULL,
+                chunk_count integer DEFAULT 0,
+                PRIMARY KEY (name, filename)
+            )
+        """)
+        logger.info("✅ Created resumes_meta table")
+        
+        # Keep resumes_meta up to date from a trigger, like vacancy_statistics,
+        # so every writer (API, resume manager, manual SQL) is accounted for.
+        # Chunks without a name or filename don't belong to a candidate.
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION public.update_resumes_meta()
+            RETURNS trigger
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE public.resumes_meta
+                    SET chunk_count = chunk_count - 1
+                    WHERE name = OLD.name AND filename = OLD.filename;
+                    DELETE FROM public.resumes_meta
+                    WHERE name = OLD.name AND filename = OLD.filename AND chunk_count <= 0;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.name IS NOT NULL AND NEW.filename IS NOT NULL THEN
+                    INSERT INTO public.resumes_meta (name, filename, chunk_count)
+                    VALUES (NEW.name, NEW.filename, 1)
+                    ON CONFLICT (name, filename)
+                    DO UPDATE SET chunk_count = public.resumes_meta.chunk_count + 1;
+                END IF;
+                RETURN NULL;
+            END;
+            $$
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS resumes_meta_trigger ON public.resumes")
+        cursor.execute("""
+            CREATE TRIGGER resumes_meta_trigger
+            AFTER INSERT OR DELETE OR UPDATE OF name, filename ON public.resumes
+            FOR EACH ROW
+            EXECUTE FUNCTION public.update_resumes_meta()
+        """)
+        
+        # Rebuild it from the chunks, in the same transaction as the trigger,
+        # so resumes stored before the trigger existed are included
+        cursor.execute("DELETE FROM public.resumes_meta")
+        cursor.execute("""
+            INSERT INTO public.resumes_meta (name, filename, chunk_count)
+            SELECT name, filename, COUNT(*)
+            FROM public.resumes
+            WHERE name IS NOT NULL AND filename IS NOT NULL
+            GROUP BY name, filename
+        """)
+        logger.info("✅ Created resumes_meta trigger")
+        
         # Create vacancies table with Dutch field names (to match combined_process.py)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS public.vacancies (
@@ -216,6 +319,76 @@ def initialize_database():
         """)
         logger.info("✅ Created vacancies table")
         
+        # Index the listing sort order so paged queries read rows pre-sorted
+        # instead of sorting the whole table on every request
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_vacancies_created_at_id
+            ON public.vacancies (created_at DESC, id DESC)
+        """)
+        logger.info("✅ Created vacancies sort index")
+        
+        # Index the case-insensitive status filter together with the sort order,
+        # so a status-filtered page is a single index range scan
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_vacancies_status_created_at_id
+            ON public.vacancies (LOWER(status), created_at DESC, id DESC)
+        """)
+        logger.info("✅ Created vacancies status index")
+        
+        # Collapse match details stored character by character ({"0": "G", "1": "e", ...})
+        # into a plain JSON string in the database, for every writer, so reads
+        # don't have to reassemble them
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION public.collapse_character_jsonb(value jsonb)
+            RETURNS jsonb
+            LANGUAGE sql
+            IMMUTABLE
+            AS $$
+                SELECT CASE
+                    WHEN jsonb_typeof(value) = 'object'
+                         AND value <> '{}'::jsonb
+                         AND NOT EXISTS (
+                             SELECT 1 FROM jsonb_object_keys(value) AS k
+                             WHERE k !~ '^[0-9]+$'
+                         )
+                    THEN to_jsonb((
+                        SELECT string_agg(chars.value, '' ORDER BY chars.key::int)
+                        FROM jsonb_each_text(value) AS chars
+                    ))
+                    ELSE value
+                END
+            $$
+        """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION public.normalize_match_toelichting()
+            RETURNS trigger
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                NEW.match_toelichting := public.collapse_character_jsonb(NEW.match_toelichting);
+                RETURN NEW;
+            END;
+            $$
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS vacancies_match_toelichting_trigger ON public.vacancies")
+        cursor.execute("""
+            CREATE TRIGGER vacancies_match_toelichting_trigger
+            BEFORE INSERT OR UPDATE OF match_toelichting ON public.vacancies
+            FOR EACH ROW
+            EXECUTE FUNCTION public.normalize_match_toelichting()
+        """)
+        logger.info("✅ Created match details normalization trigger")
+        
+        # Collapse rows written before the trigger existed, once
+        cursor.execute("""
+            UPDATE public.vacancies
+            SET match_toelichting = public.collapse_character_jsonb(match_toelichting)
+            WHERE jsonb_typeof(match_toelichting) = 'object'
+              AND public.collapse_character_jsonb(match_toelichting) IS DISTINCT FROM match_toelichting
+        """)
+        if cursor.rowcount:
+            logger.info(f"✅ Collapsed character-by-character match details in {cursor.rowcount} vacancies")
+        
         # Create vacancy_statistics table for faster counts
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS public.vacancy_statistics (
@@ -227,6 +400,42 @@ def initialize_database():
         """)
         logger.info("✅ Created vacancy_statistics table")
         
+        # Keep vacancy_statistics up to date from a trigger, so every writer
+        # (API, processing pipeline, manual SQL) is counted and reading the
+        # statistics never has to count the vacancies table
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION public.update_vacancy_statistics()
+            RETURNS trigger
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE public.vacancy_statistics
+                    SET count = GREATEST(0, count - 1),
+                        last_updated = CURRENT_TIMESTAMP
+                    WHERE status = COALESCE(OLD.status, 'Unknown');
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO public.vacancy_statistics (status, count)
+                    VALUES (COALESCE(NEW.status, 'Unknown'), 1)
+                    ON CONFLICT (status)
+                    DO UPDATE SET
+                        count = public.vacancy_statistics.count + 1,
+                        last_updated = CURRENT_TIMESTAMP;
+                END IF;
+                RETURN NULL;
+            END;
+            $$
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS vacancies_statistics_trigger ON public.vacancies")
+        cursor.execute("""
+            CREATE TRIGGER vacancies_statistics_trigger
+            AFTER INSERT OR DELETE OR UPDATE OF status ON public.vacancies
+            FOR EACH ROW
+            EXECUTE FUNCTION public.update_vacancy_statistics()
+        """)
+        logger.info("✅ Created vacancy_statistics trigger")
+        
         # Create vector similarity function
         cursor.execute("""
             CREATE OR REPLACE FUNCTION public.match_resumes(
@@ -293,6 +502,31 @@ def initialize_database():
         logger.error(f"❌ Error initializing database: {str(e)}")
         return False
 
+def rebuild_embedding_index(conn):
+    """
+    Rebuild the embedding index on the given connection, e.g. after a bulk load
+    
+    An HNSW graph grown one insert at a time is slower to search than one built
+    over all rows at once. The rebuild runs concurrently, so matches keep using
+    the old index until the new one is ready. Errors are raised to the caller.
+    """
+    # REINDEX CONCURRENTLY can't run inside a transaction block
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SET maintenance_work_mem = %s", (INDEX_MAINTENANCE_WORK_MEM,))
+            try:
+                for index_name in EMBEDDING_INDEX_NAMES:
+                    cursor.execute("SELECT to_regclass(%s)", (f"public.{index_name}",))
+                    if cursor.fetchone()[0] is not None:
+                        cursor.execute(f"REINDEX INDEX CONCURRENTLY public.{index_name}")
+                        logger.info(f"✅ Rebuilt embedding index {index_name}")
+            finally:
+                # The setting is per session; don't leave it on a reused connection
+                cursor.execute("RESET maintenance_work_mem")
+    finally:
+        conn.autocommit = False
+
 def add_test_data():
     """Add test data to the database"""
     try:
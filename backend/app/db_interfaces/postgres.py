@@ -8,8 +8,11 @@ import os
 import json
 import logging
 import datetime
+import threading
 import psycopg2
 import psycopg2.extras
+import psycopg2.extensions
+import psycopg2.pool
 from typing import List, Dict, Any, Optional, Tuple
 
 from app.config import (
@@ -18,23 +21,128 @@ from app.config import (
 
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by all requests, created on first use. Opening a new
+# connection per call costs a TCP round trip and authentication every time.
+PG_POOL_MIN_CONNECTIONS = int(os.getenv("PG_POOL_MIN_CONNECTIONS", "1"))
+PG_POOL_MAX_CONNECTIONS = int(os.getenv("PG_POOL_MAX_CONNECTIONS", "10"))
+_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises instead of waiting when it is exhausted, so
+# callers wait for a free slot here first, but no longer than this many seconds
+PG_POOL_TIMEOUT_SECONDS = float(os.getenv("PG_POOL_TIMEOUT_SECONDS", "30"))
+_pool_slots = threading.BoundedSemaphore(PG_POOL_MAX_CONNECTIONS)
+# Candidates an HNSW index scan keeps per search, set on every pooled session.
+# pgvector's default of 40 is below the count a resume match may ask for, and
+# a scan never returns more rows than this.
+PG_HNSW_EF_SEARCH = int(os.getenv("PG_HNSW_EF_SEARCH", "100"))
+
+def get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    """Get the PostgreSQL connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    PG_POOL_MIN_CONNECTIONS,
+                    PG_POOL_MAX_CONNECTIONS,
+                    host=PG_HOST,
+                    port=PG_PORT,
+                    user=PG_USER,
+                    password=PG_PASSWORD,
+                    database=PG_DATABASE,
+                    options=f"-c hnsw.ef_search={PG_HNSW_EF_SEARCH}"
+                )
+    return _pool
+
 def get_connection():
-    """Get a PostgreSQL connection"""
+    """Get a PostgreSQL connection from the pool; hand it back with release_connection"""
+    if not _pool_slots.acquire(timeout=PG_POOL_TIMEOUT_SECONDS):
+        # Fail the request instead of leaving the worker thread blocked forever
+        logger.error(f"❌ No PostgreSQL connection available after {PG_POOL_TIMEOUT_SECONDS}s")
+        raise psycopg2.pool.PoolError("connection pool exhausted")
     try:
-        conn = psycopg2.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            database=PG_DATABASE
-        )
-        return conn
+        return get_pool().getconn()
     except Exception as e:
+        _pool_slots.release()
         logger.error(f"❌ Error connecting to PostgreSQL: {str(e)}")
         raise e
 
-def get_all_vacancies(status: Optional[str] = None, skip: int = 0, limit: int = 10000) -> List[Dict[str, Any]]:
-    """Get all vacancies from PostgreSQL with filtering and pagination"""
+def release_connection(conn):
+    """Return a connection to the pool, discarding it if it is broken"""
+    try:
+        discard = bool(conn.closed)
+        if not discard and conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            # Don't hand an open transaction to the next user of the connection
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        get_pool().putconn(conn, close=discard)
+    finally:
+        _pool_slots.release()
+
+def close_pool():
+    """Close all pooled connections, e.g. on application shutdown"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+def _map_vacancy_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the English field names expected by the frontend to a vacancies row, in place"""
+    # Include the ID as a string
+    if 'id' in result:
+        result['Id'] = str(result['id'])
+    
+    # Map the Dutch field names to English field names expected by frontend
+    if 'url' in result:
+        result['URL'] = result['url']
+    if 'functie' in result:
+        result['Functie'] = result['functie']
+    if 'klant' in result:
+        result['Klant'] = result['klant']
+    if 'status' in result:
+        result['Status'] = result['status']
+    if 'functieomschrijving' in result:
+        result['Functieomschrijving'] = result['functieomschrijving']
+    if 'branche' in result:
+        result['Branche'] = result['branche']
+    if 'regio' in result:
+        result['Regio'] = result['regio']
+    if 'uren' in result:
+        result['Uren'] = result['uren']
+    if 'tarief' in result:
+        result['Tarief'] = result['tarief']
+    if 'geplaatst' in result:
+        # Format the timestamp as a readable date
+        if isinstance(result['geplaatst'], datetime.date):
+            result['Geplaatst'] = result['geplaatst'].isoformat()[:10]
+        else:
+            result['Geplaatst'] = str(result['geplaatst'])
+    if 'sluiting' in result:
+        # Format the timestamp as a readable date
+        if isinstance(result['sluiting'], datetime.date):
+            result['Sluiting'] = result['sluiting'].isoformat()[:10]
+        else:
+            result['Sluiting'] = str(result['sluiting'])
+    if 'top_match' in result:
+        result['Top_Match'] = result['top_match']
+    if 'match_toelichting' in result:
+        result['Match_Toelichting'] = result['match_toelichting']
+    if 'checked_resumes' in result:
+        result['Checked_resumes'] = result['checked_resumes']
+    return result
+
+def get_all_vacancies(status: Optional[str] = None, skip: int = 0, limit: int = 10000,
+                      after: Optional[Tuple[datetime.datetime, int]] = None) -> Dict[str, Any]:
+    """
+    Get a page of vacancies from PostgreSQL with filtering, sorting and pagination done in SQL.
+    
+    When `after` is given as a (created_at, id) keyset, the page starts right after
+    that row instead of using OFFSET, so deep pages cost the same as the first one.
+    The result includes `next_key`, the keyset of the last row on the page.
+    """
     conn = None
     cursor = None
     try:
@@ -51,90 +159,91 @@ def get_all_vacancies(status: Optional[str] = None, skip: int = 0, limit: int =
             where_clause = " WHERE LOWER(status) = LOWER(%s)"
             params.append(status)
         
-        # Get total count first with the same filters, but no pagination
-        count_query = f"SELECT COUNT(*) {base_query}{where_clause}"
-        cursor.execute(count_query, params)
-        total_count = cursor.fetchone()["count"]
+        # Get the actual data with pagination first; its size may make a count unnecessary
+        data_params = list(params)
+        if after is not None:
+            # Keyset pagination: continue after the given (created_at, id) row
+            where_clause += " AND (created_at, id) < (%s, %s)" if where_clause else " WHERE (created_at, id) < (%s, %s)"
+            data_params.extend(after)
         
-        # Now get the actual data with pagination
-        data_query = f"SELECT * {base_query}{where_clause} ORDER BY created_at DESC"
+        # id breaks ties between equal timestamps so pages are stable and the
+        # ordering matches idx_vacancies_created_at_id
+        data_query = f"SELECT * {base_query}{where_clause} ORDER BY created_at DESC, id DESC"
         
         # Only add LIMIT and OFFSET if they are provided and non-zero
         if limit > 0:
             data_query += " LIMIT %s"
-            params.append(limit)
+            data_params.append(limit)
             
-        if skip > 0:
+        if skip > 0 and after is None:
             data_query += " OFFSET %s"
-            params.append(skip)
+            data_params.append(skip)
         
-        cursor.execute(data_query, params)
+        cursor.execute(data_query, data_params)
         rows = cursor.fetchall()
         
+        # A short OFFSET page is the last one, so the filtered count follows from
+        # the offset and no count query is needed (unless the offset is past the end)
+        total_count = None
+        if after is None and (limit <= 0 or len(rows) < limit) and (rows or skip == 0):
+            total_count = skip + len(rows)
+        
+        # Get the missing counts: the filtered count and/or the count over all
+        # statuses, in a single round trip. They are read from the per-status
+        # counters that vacancies_statistics_trigger maintains, which costs one
+        # row per status instead of a COUNT(*) scan of the vacancies table.
+        if total_count is None:
+            if status:
+                cursor.execute(
+                    "SELECT COALESCE(SUM(count) FILTER (WHERE LOWER(status) = LOWER(%s)), 0) AS count, "
+                    "COALESCE(SUM(count), 0) AS total_all FROM vacancy_statistics",
+                    (status,)
+                )
+            else:
+                cursor.execute(
+                    "SELECT COALESCE(SUM(count), 0) AS count, "
+                    "COALESCE(SUM(count), 0) AS total_all FROM vacancy_statistics"
+                )
+            counts = cursor.fetchone()
+            total_count = counts["count"]
+            total_all = counts["total_all"]
+        elif status:
+            cursor.execute("SELECT COALESCE(SUM(count), 0) AS total_all FROM vacancy_statistics")
+            total_all = cursor.fetchone()["total_all"]
+        else:
+            # Without a status filter the filtered count is the overall count
+            total_all = total_count
+        
+        # Keyset of the last row, for fetching the next page without OFFSET
+        next_key = None
+        if rows and limit > 0 and len(rows) == limit and rows[-1]["created_at"] is not None:
+            next_key = (rows[-1]["created_at"], rows[-1]["id"])
+        
         # Convert to list of dictionaries and normalize field names using Dutch-to-English mapping
         results = []
         for row in rows:
             result = dict(row)
             
-            # Add field mapping for consistency with frontend
-            # First, include the ID
-            if 'id' in result:
-                result['Id'] = str(result['id'])
-            
-            # Map the Dutch field names to English field names expected by frontend
-            if 'url' in result:
-                result['URL'] = result['url']
-            if 'functie' in result:
-                result['Functie'] = result['functie']
-            if 'klant' in result:
-                result['Klant'] = result['klant']
-            if 'status' in result:
-                result['Status'] = result['status']
-            if 'functieomschrijving' in result:
-                result['Functieomschrijving'] = result['functieomschrijving']
-            if 'branche' in result:
-                result['Branche'] = result['branche']
-            if 'regio' in result:
-                result['Regio'] = result['regio']
-            if 'uren' in result:
-                result['Uren'] = result['uren']
-            if 'tarief' in result:
-                result['Tarief'] = result['tarief']
-            if 'geplaatst' in result:
-                # Format the timestamp as a readable date
-                if isinstance(result['geplaatst'], datetime.datetime):
-                    result['Geplaatst'] = result['geplaatst'].strftime('%Y-%m-%d')
-                else:
-                    result['Geplaatst'] = str(result['geplaatst'])
-            if 'sluiting' in result:
-                # Format the timestamp as a readable date
-                if isinstance(result['sluiting'], datetime.datetime):
-                    result['Sluiting'] = result['sluiting'].strftime('%Y-%m-%d')
-                else:
-                    result['Sluiting'] = str(result['sluiting'])
-            if 'top_match' in result:
-                result['Top_Match'] = result['top_match']
-            if 'match_toelichting' in result:
-                result['Match_Toelichting'] = result['match_toelichting']
-            if 'checked_resumes' in result:
-                result['Checked_resumes'] = result['checked_resumes']
-                
+            _map_vacancy_row(result)
             results.append(result)
             
-        # Return both the results and the total count
+        # Return the page together with the filtered and overall counts
         return {
             "items": results,
             "total": total_count,
-            "filtered_count": len(results)
+            "total_all": total_all,
+            "filtered_count": len(results),
+            "next_key": next_key
         }
     except Exception as e:
         logger.error(f"Error getting vacancies: {str(e)}")
-        return []
+        # Let the caller report the error; an empty page would end up in the cache
+        raise
     finally:
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            release_connection(conn)
 
 def get_vacancy(vacancy_id: str) -> Optional[Dict[str, Any]]:
     """Get a vacancy by ID"""
@@ -148,49 +257,7 @@ def get_vacancy(vacancy_id: str) -> Optional[Dict[str, Any]]:
         row = cursor.fetchone()
         
         if row:
-            result = dict(row)
-            
-            # Map fields for consistency with frontend (same as in get_all_vacancies)
-            if 'id' in result:
-                result['Id'] = str(result['id'])
-            if 'url' in result:
-                result['URL'] = result['url']
-            if 'functie' in result:
-                result['Functie'] = result['functie']
-            if 'klant' in result:
-                result['Klant'] = result['klant']
-            if 'status' in result:
-                result['Status'] = result['status']
-            if 'functieomschrijving' in result:
-                result['Functieomschrijving'] = result['functieomschrijving']
-            if 'branche' in result:
-                result['Branche'] = result['branche']
-            if 'regio' in result:
-                result['Regio'] = result['regio']
-            if 'uren' in result:
-                result['Uren'] = result['uren']
-            if 'tarief' in result:
-                result['Tarief'] = result['tarief']
-            if 'geplaatst' in result:
-                # Format the timestamp as a readable date
-                if isinstance(result['geplaatst'], datetime.datetime):
-                    result['Geplaatst'] = result['geplaatst'].strftime('%Y-%m-%d')
-                else:
-                    result['Geplaatst'] = str(result['geplaatst'])
-            if 'sluiting' in result:
-                # Format the timestamp as a readable date
-                if isinstance(result['sluiting'], datetime.datetime):
-                    result['Sluiting'] = result['sluiting'].strftime('%Y-%m-%d')
-                else:
-                    result['Sluiting'] = str(result['sluiting'])
-            if 'top_match' in result:
-                result['Top_Match'] = result['top_match']
-            if 'match_toelichting' in result:
-                result['Match_Toelichting'] = result['match_toelichting']
-            if 'checked_resumes' in result:
-                result['Checked_resumes'] = result['checked_resumes']
-            
-            return result
+            return _map_vacancy_row(dict(row))
         return None
     except Exception as e:
         logger.error(f"Error getting vacancy {vacancy_id}: {str(e)}")
@@ -199,7 +266,7 @@ def get_vacancy(vacancy_id: str) -> Optional[Dict[str, Any]]:
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            release_connection(conn)
 
 def create_vacancy(vacancy_data: Dict[str, Any]) -> Dict[str, Any]:
     """Create a new vacancy"""
@@ -238,6 +305,10 @@ def create_vacancy(vacancy_data: Dict[str, Any]) -> Dict[str, Any]:
             # If the key is already lowercase, assume it's a direct column name
             elif key.islower():
                 db_data[key] = value
+        
+        # Store match details as a JSON value, so plain text is accepted by the jsonb column
+        if db_data.get('match_toelichting') is not None:
+            db_data['match_toelichting'] = psycopg2.extras.Json(db_data['match_toelichting'])
                 
         # Prepare fields and values
         fields = list(db_data.keys())
@@ -251,12 +322,7 @@ def create_vacancy(vacancy_data: Dict[str, Any]) -> Dict[str, Any]:
         vacancy_data['id'] = vacancy_id
         vacancy_data['Id'] = str(vacancy_id)
         
-        # Get the status for statistics updating
-        status = db_data.get('status') or vacancy_data.get('Status') or 'Unknown'
-        
-        # Update vacancy statistics
-        update_vacancy_statistics(conn, new_status=status)
-        
+        # vacancy_statistics is kept up to date by the vacancies_statistics_trigger
         conn.commit()
         return vacancy_data
     except Exception as e:
@@ -268,23 +334,20 @@ def create_vacancy(vacancy_data: Dict[str, Any]) -> Dict[str, Any]:
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            release_connection(conn)
 
-def update_vacancy(vacancy_id: str, vacancy_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Update an existing vacancy"""
+def update_vacancy(vacancy_id: str, vacancy_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Update an existing vacancy and return its new state, or None if it does not exist.
+    
+    The update returns the updated row in the same statement, so no separate
+    reads are needed for the 404 check or the response.
+    """
     conn = None
     cursor = None
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        
-        # First, check if the status is being updated by getting the current status
-        old_status = None
-        if 'Status' in vacancy_data or 'status' in vacancy_data:
-            cursor.execute("SELECT status FROM vacancies WHERE id = %s", (vacancy_id,))
-            result = cursor.fetchone()
-            if result:
-                old_status = result[0]
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
         # Map frontend/model field names to database field names
         field_mapping = {
@@ -316,6 +379,10 @@ def update_vacancy(vacancy_id: str, vacancy_data: Dict[str, Any]) -> Dict[str, A
             elif key.islower():
                 db_data[key] = value
         
+        # Store match details as a JSON value, so plain text is accepted by the jsonb column
+        if db_data.get('match_toelichting') is not None:
+            db_data['match_toelichting'] = psycopg2.extras.Json(db_data['match_toelichting'])
+        
         # Prepare SET clause and values
         set_clause = []
         values = []
@@ -324,63 +391,51 @@ def update_vacancy(vacancy_id: str, vacancy_data: Dict[str, Any]) -> Dict[str, A
             set_clause.append(f"{key} = %s")
             values.append(value)
         
-        values.append(vacancy_id)
+        if set_clause:
+            query = f"UPDATE vacancies SET {', '.join(set_clause)} WHERE id = %s RETURNING *"
+            values.append(vacancy_id)
+            cursor.execute(query, values)
+        else:
+            # Nothing to update, only return the current state
+            cursor.execute("SELECT * FROM vacancies WHERE id = %s", (vacancy_id,))
         
-        query = f"UPDATE vacancies SET {', '.join(set_clause)} WHERE id = %s"
-        cursor.execute(query, values)
+        row = cursor.fetchone()
         
-        # Check if status is being updated, and update statistics if needed
-        new_status = None
-        if 'status' in db_data:
-            new_status = db_data['status']
-        elif 'Status' in vacancy_data:
-            new_status = vacancy_data['Status']
-            
-        if old_status is not None and new_status is not None and old_status != new_status:
-            # Status has changed, update statistics
-            update_vacancy_statistics(conn, new_status=new_status, old_status=old_status)
+        # No matching row means the vacancy doesn't exist
+        if row is None:
+            logger.warning(f"Vacancy with ID {vacancy_id} not found for update")
+            conn.rollback()
+            return None
         
+        # vacancy_statistics is kept up to date by the vacancies_statistics_trigger
         conn.commit()
         
-        # Add ID back to the data for response
-        vacancy_data['id'] = vacancy_id
-        vacancy_data['Id'] = str(vacancy_id)
-        
-        return vacancy_data
+        return _map_vacancy_row(dict(row))
     except Exception as e:
         logger.error(f"Error updating vacancy {vacancy_id}: {str(e)}")
         if conn:
             conn.rollback()
-        return vacancy_data
+        raise
     finally:
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            release_connection(conn)
 
-def delete_vacancy(vacancy_id: str) -> bool:
-    """Delete a vacancy"""
+def delete_vacancy(vacancy_id: str) -> Optional[bool]:
+    """Delete a vacancy, returning None if it does not exist and False on errors"""
     conn = None
     cursor = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
         
-        # Get the status of the vacancy before deleting it
-        cursor.execute("SELECT status FROM vacancies WHERE id = %s", (vacancy_id,))
-        result = cursor.fetchone()
-        
-        if not result:
-            logger.warning(f"Vacancy with ID {vacancy_id} not found for deletion")
-            return False
-            
-        old_status = result[0]
-        
-        # Delete the vacancy
+        # Delete the vacancy; vacancy_statistics is kept up to date by the trigger
         cursor.execute("DELETE FROM vacancies WHERE id = %s", (vacancy_id,))
         
-        # Update the statistics
-        update_vacancy_statistics(conn, old_status=old_status)
+        if cursor.rowcount == 0:
+            logger.warning(f"Vacancy with ID {vacancy_id} not found for deletion")
+            return None
         
         conn.commit()
         return True
@@ -393,7 +448,7 @@ def delete_vacancy(vacancy_id: str) -> bool:
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            release_connection(conn)
 
 def ensure_statistics_table(conn=None):
     """Ensure the vacancy_statistics table exists"""
@@ -427,58 +482,7 @@ def ensure_statistics_table(conn=None):
         if cursor:
             cursor.close()
         if should_close_conn and conn:
-            conn.close()
-
-def update_vacancy_statistics(conn=None, new_status=None, old_status=None):
-    """Update the vacancy statistics table when a vacancy is added, updated, or deleted"""
-    should_close_conn = False
-    cursor = None
-    try:
-        if conn is None:
-            conn = get_connection()
-            should_close_conn = True
-            
-        cursor = conn.cursor()
-        
-        # Ensure the statistics table exists
-        ensure_statistics_table(conn)
-        
-        # If a vacancy was added or its status changed to new_status
-        if new_status:
-            # Try to update the count for the status
-            cursor.execute("""
-            INSERT INTO vacancy_statistics (status, count) 
-            VALUES (%s, 1)
-            ON CONFLICT (status) 
-            DO UPDATE SET 
-                count = vacancy_statistics.count + 1,
-                last_updated = CURRENT_TIMESTAMP
-            """, (new_status,))
-        
-        # If a vacancy was deleted or its status changed from old_status
-        if old_status:
-            # Decrement the count for the old status
-            cursor.execute("""
-            UPDATE vacancy_statistics 
-            SET count = GREATEST(0, count - 1),
-                last_updated = CURRENT_TIMESTAMP
-            WHERE status = %s
-            """, (old_status,))
-        
-        if should_close_conn:
-            conn.commit()
-        
-        return True
-    except Exception as e:
-        logger.error(f"Error updating vacancy statistics: {str(e)}")
-        if should_close_conn and conn:
-            conn.rollback()
-        return False
-    finally:
-        if cursor:
-            cursor.close()
-        if should_close_conn and conn:
-            conn.close()
+            release_connection(conn)
 
 def rebuild_vacancy_statistics():
     """Rebuild the vacancy statistics from scratch by counting all vacancies"""
@@ -494,12 +498,12 @@ def rebuild_vacancy_statistics():
         # Clear existing statistics
         cursor.execute("TRUNCATE TABLE vacancy_statistics")
         
-        # Get counts by status
+        # Get counts by status, under the same key the statistics trigger uses
         cursor.execute("""
         INSERT INTO vacancy_statistics (status, count)
-        SELECT status, COUNT(*) 
+        SELECT COALESCE(status, 'Unknown'), COUNT(*) 
         FROM vacancies 
-        GROUP BY status
+        GROUP BY COALESCE(status, 'Unknown')
         """)
         
         conn.commit()
@@ -514,7 +518,7 @@ def rebuild_vacancy_statistics():
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            release_connection(conn)
 
 def get_vacancy_statistics() -> Dict[str, int]:
     """Get the current vacancy statistics"""
@@ -527,20 +531,13 @@ def get_vacancy_statistics() -> Dict[str, int]:
         # Ensure the statistics table exists
         ensure_statistics_table(conn)
         
-        # Get the statistics
+        # Get the statistics; one row per status, so the total is summed here
         cursor.execute("SELECT status, count FROM vacancy_statistics")
         rows = cursor.fetchall()
         
         # Convert to a dictionary
         stats = {row['status']: row['count'] for row in rows}
-        
-        # Get the total count
-        cursor.execute("SELECT SUM(count) as total FROM vacancy_statistics")
-        total = cursor.fetchone()
-        if total and total['total']:
-            stats['total'] = total['total']
-        else:
-            stats['total'] = 0
+        stats['total'] = sum(stats.values())
             
         return stats
     except Exception as e:
@@ -550,4 +547,4 @@ def get_vacancy_statistics() -> Dict[str, int]:
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
\ No newline at end of file
+            release_connection(conn)
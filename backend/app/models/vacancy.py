@@ -5,7 +5,7 @@ This module defines the Pydantic models for vacancy data.
 """
 
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 import uuid
 
@@ -55,6 +55,14 @@ class Vacancy(VacancyBase):
     Match_Toelichting: Optional[str] = Field(None, description="Match explanation")
     Checked_resumes: Optional[str] = Field(None, description="List of checked resumes")
     
+    @field_validator('id', mode='before')
+    @classmethod
+    def coerce_id(cls, v: Any) -> Any:
+        """Accept integer database IDs and store them as strings."""
+        if isinstance(v, int):
+            return str(v)
+        return v
+    
     class Config:
         # Allow additional fields
         extra = "allow"
@@ -88,6 +96,7 @@ class VacancyList(BaseModel):
     items: List[Vacancy]
     total: int
     total_all: Optional[int] = None
+    next_cursor: Optional[str] = None
     
     class Config:
         # Allow extra fields for backward compatibility
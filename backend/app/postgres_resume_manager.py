@@ -33,6 +33,9 @@ from dotenv import load_dotenv
 from pypdf import PdfReader
 from openai import OpenAI
 
+# Local imports
+from app.db_init import rebuild_embedding_index
+
 # Load environment variables
 load_dotenv()
 
@@ -49,6 +52,10 @@ PG_PASSWORD = os.getenv("PG_PASSWORD", "postgres")
 PG_DATABASE = os.getenv("PG_DATABASE", "resumeai")
 PG_TABLE = "resumes"
 
+# Resumes a directory run must store before the embedding index is rebuilt;
+# below this, rebuilding the graph over every chunk costs more than it saves
+REINDEX_MIN_RESUMES = int(os.getenv("REINDEX_MIN_RESUMES", "20"))
+
 # Set up OpenAI client
 client_openai = OpenAI(api_key=OPENAI_API_KEY)
 
@@ -77,6 +84,10 @@ def get_embedding(text):
     )
     return response.data[0].embedding
 
+def to_vector_literal(embedding):
+    """Format an embedding as a pgvector text literal ("[0.1,0.2,...]")"""
+    return "[" + ",".join(map(str, embedding)) + "]"
+
 def split_text(text, max_tokens=500):
     """Split a long text into chunks of max tokens"""
     enc = tiktoken.get_encoding("cl100k_base")
@@ -130,19 +141,21 @@ def upload_resume(conn, pdf_path):
             cursor.close()
             return False
         
-        # Embed chunks and save to PostgreSQL
+        # Embed chunks
+        rows = []
         for i, chunk in enumerate(chunks):
             embedding = get_embedding(chunk)
             time.sleep(1)  # Prevent API rate limiting
-            
-            # Save to PostgreSQL
-            cursor.execute(
-                f"""
-                INSERT INTO {PG_TABLE} (name, filename, cv_chunk, embedding)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (name, pdf_file, chunk, embedding)
-            )
+            rows.append((name, pdf_file, chunk, to_vector_literal(embedding)))
+        
+        # Save all chunks to PostgreSQL in one statement
+        psycopg2.extras.execute_values(
+            cursor,
+            f"INSERT INTO {PG_TABLE} (name, filename, cv_chunk, embedding) VALUES %s",
+            rows,
+            template="(%s, %s, %s, %s::vector)",
+            page_size=500
+        )
         
         conn.commit()
         cursor.close()
@@ -248,8 +261,8 @@ def list_resumes(conn):
         print(f"❌ Error listing resumes: {str(e)}")
         return []
 
-def process_directory(conn, directory, action="upload"):
-    """Process all PDF files in a directory"""
+def process_directory(conn, directory, action="upload", rebuild_index=False):
+    """Process all PDF files in a directory, rebuilding the embedding index after a bulk load"""
     pdf_files = [f for f in os.listdir(directory) if f.endswith(".pdf")]
     
     if not pdf_files:
@@ -268,6 +281,13 @@ def process_directory(conn, directory, action="upload"):
                 success_count += 1
     
     print(f"✅ Processed {success_count} of {len(pdf_files)} resumes.")
+    
+    if success_count >= REINDEX_MIN_RESUMES or (rebuild_index and success_count > 0):
+        print("🔧 Rebuilding embedding index...")
+        try:
+            rebuild_embedding_index(conn)
+        except Exception as e:
+            print(f"❌ Error rebuilding embedding index: {str(e)}")
     return True
 
 def main():
@@ -282,6 +302,8 @@ def main():
     action_group.add_argument("--replace-dir", help="Replace all resumes in directory", metavar="DIR")
     action_group.add_argument("--delete", help="Delete a resume", metavar="FILE")
     action_group.add_argument("--list", action="store_true", help="List all resumes")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help=f"Rebuild the embedding index after --upload-dir/--replace-dir even below {REINDEX_MIN_RESUMES} resumes")
     
     args = parser.parse_args()
     
@@ -292,11 +314,11 @@ def main():
         if args.upload:
             upload_resume(conn, args.upload)
         elif args.upload_dir:
-            process_directory(conn, args.upload_dir, "upload")
+            process_directory(conn, args.upload_dir, "upload", args.rebuild_index)
         elif args.replace:
             replace_resume(conn, args.replace)
         elif args.replace_dir:
-            process_directory(conn, args.replace_dir, "replace")
+            process_directory(conn, args.replace_dir, "replace", args.rebuild_index)
         elif args.delete:
             delete_resume(conn, args.delete)
         elif args.list:
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Import services
-from app.services.database_service import db_service, DatabaseService
+from app.services.database_service import get_db_service
 from app.services.email_service import email_service
 
 # Settings model
@@ -110,6 +110,65 @@ class SettingsUpdate(BaseModel):
     email_recipients: Optional[str] = None
     email_digest_subject: Optional[str] = None
 
+def _build_settings_from_env_dict(env: Dict[str, str]) -> Settings:
+    """
+    Build a Settings response from a mapping of environment variable names to values.
+    
+    Used by both get_settings (with os.environ) and update_settings (with the
+    freshly written .env values) so a save doesn't need to re-read the .env file.
+    
+    Args:
+        env: Mapping of environment variable names to their string values
+        
+    Returns:
+        Settings object with sensitive values redacted
+    """
+    # Import PROMPT_TEMPLATE from config
+    from app.config import PROMPT_TEMPLATE
+    
+    # Create settings object with redacted sensitive values
+    return Settings(
+        openai_api_key="*****" if env.get("OPENAI_API_KEY") else None,
+        
+        # PostgreSQL settings
+        pg_host=env.get("PG_HOST", "localhost"),
+        pg_port=env.get("PG_PORT", "5432"),
+        pg_user=env.get("PG_USER", "postgres"),
+        pg_password="*****" if env.get("PG_PASSWORD") else None,
+        pg_database=env.get("PG_DATABASE", "resumeai"),
+        
+        # Spinweb settings
+        spinweb_user=env.get("SPINWEB_USER"),
+        spinweb_pass="*****" if env.get("SPINWEB_PASS") else None,
+        
+        # Matching settings
+        excluded_clients=env.get("EXCLUDED_CLIENTS"),
+        ai_model=env.get("AI_MODEL", "gpt-4o-mini"),
+        match_threshold=float(env.get("MATCH_THRESHOLD", "0.75")),
+        match_count=int(env.get("MATCH_COUNT", "20")),
+        resume_prompt_template=PROMPT_TEMPLATE,
+        
+        # Scheduler settings
+        scheduler_enabled=env.get("SCHEDULER_ENABLED", "false").lower() == "true",
+        scheduler_start_hour=int(env.get("SCHEDULER_START_HOUR", "6")),
+        scheduler_end_hour=int(env.get("SCHEDULER_END_HOUR", "20")),
+        scheduler_interval_minutes=int(env.get("SCHEDULER_INTERVAL_MINUTES", "60")),
+        scheduler_days=env.get("SCHEDULER_DAYS", "mon,tue,wed,thu,fri"),
+        
+        # Email settings
+        email_enabled=env.get("EMAIL_ENABLED", "false").lower() == "true",
+        email_provider=env.get("EMAIL_PROVIDER", "smtp"),
+        email_smtp_host=env.get("EMAIL_SMTP_HOST", "smtp.example.com"),
+        email_smtp_port=int(env.get("EMAIL_SMTP_PORT", "587")),
+        email_smtp_use_tls=env.get("EMAIL_SMTP_USE_TLS", "true").lower() == "true",
+        email_username=env.get("EMAIL_USERNAME", ""),
+        email_password="*****" if env.get("EMAIL_PASSWORD") else None,
+        email_from_email=env.get("EMAIL_FROM_EMAIL", "resumeai@example.com"),
+        email_from_name=env.get("EMAIL_FROM_NAME", "ResumeAI"),
+        email_recipients=env.get("EMAIL_RECIPIENTS", ""),
+        email_digest_subject=env.get("EMAIL_DIGEST_SUBJECT", "ResumeAI - New Processing Results")
+    )
+
 @router.get("/", response_model=Settings)
 @router.get("", response_model=Settings)  # Add route without trailing slash
 async def get_settings():
@@ -122,53 +181,7 @@ async def get_settings():
         # Load environment variables
         load_dotenv()
         
-        # Import PROMPT_TEMPLATE from config
-        from app.config import PROMPT_TEMPLATE
-        
-        # Create settings object with redacted sensitive values
-        settings = Settings(
-            openai_api_key="*****" if os.getenv("OPENAI_API_KEY") else None,
-            
-            # PostgreSQL settings
-            pg_host=os.getenv("PG_HOST", "localhost"),
-            pg_port=os.getenv("PG_PORT", "5432"),
-            pg_user=os.getenv("PG_USER", "postgres"),
-            pg_password="*****" if os.getenv("PG_PASSWORD") else None,
-            pg_database=os.getenv("PG_DATABASE", "resumeai"),
-            
-            # Spinweb settings
-            spinweb_user=os.getenv("SPINWEB_USER"),
-            spinweb_pass="*****" if os.getenv("SPINWEB_PASS") else None,
-            
-            # Matching settings
-            excluded_clients=os.getenv("EXCLUDED_CLIENTS"),
-            ai_model=os.getenv("AI_MODEL", "gpt-4o-mini"),
-            match_threshold=float(os.getenv("MATCH_THRESHOLD", "0.75")),
-            match_count=int(os.getenv("MATCH_COUNT", "20")),
-            resume_prompt_template=PROMPT_TEMPLATE,
-            
-            # Scheduler settings
-            scheduler_enabled=os.getenv("SCHEDULER_ENABLED", "false").lower() == "true",
-            scheduler_start_hour=int(os.getenv("SCHEDULER_START_HOUR", "6")),
-            scheduler_end_hour=int(os.getenv("SCHEDULER_END_HOUR", "20")),
-            scheduler_interval_minutes=int(os.getenv("SCHEDULER_INTERVAL_MINUTES", "60")),
-            scheduler_days=os.getenv("SCHEDULER_DAYS", "mon,tue,wed,thu,fri"),
-            
-            # Email settings
-            email_enabled=os.getenv("EMAIL_ENABLED", "false").lower() == "true",
-            email_provider=os.getenv("EMAIL_PROVIDER", "smtp"),
-            email_smtp_host=os.getenv("EMAIL_SMTP_HOST", "smtp.example.com"),
-            email_smtp_port=int(os.getenv("EMAIL_SMTP_PORT", "587")),
-            email_smtp_use_tls=os.getenv("EMAIL_SMTP_USE_TLS", "true").lower() == "true",
-            email_username=os.getenv("EMAIL_USERNAME", ""),
-            email_password="*****" if os.getenv("EMAIL_PASSWORD") else None,
-            email_from_email=os.getenv("EMAIL_FROM_EMAIL", "resumeai@example.com"),
-            email_from_name=os.getenv("EMAIL_FROM_NAME", "ResumeAI"),
-            email_recipients=os.getenv("EMAIL_RECIPIENTS", ""),
-            email_digest_subject=os.getenv("EMAIL_DIGEST_SUBJECT", "ResumeAI - New Processing Results")
-        )
-        
-        return settings
+        return _build_settings_from_env_dict(os.environ)
     except Exception as e:
         logger.error(f"Error getting settings: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error getting settings: {str(e)}")
@@ -328,8 +341,9 @@ async def update_settings(settings: SettingsUpdate):
                     # use the standard format
                     f.write(f"{key}=\"{value}\"\n")
         
-        # Return updated settings (with redacted sensitive values)
-        return await get_settings()
+        # Return updated settings (with redacted sensitive values), built from the
+        # values we just wrote instead of re-reading the .env file
+        return _build_settings_from_env_dict({**os.environ, **current_env})
     except Exception as e:
         logger.error(f"Error updating settings: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error updating settings: {str(e)}")
@@ -348,17 +362,15 @@ async def get_database_status():
     """
     try:
         # Check connection to PostgreSQL
+        db_service = get_db_service()
         status = db_service.get_connection_status()
         
         # Add resume counts
         counts = {}
         
-        # Create independent database service for counting
         if status.get("postgres", False):
             try:
-                # Create a dedicated service instance for this query
-                postgres_service = DatabaseService()
-                counts["postgres"] = postgres_service.count_resumes()
+                counts["postgres"] = db_service.count_resumes()
             except Exception as e:
                 logger.warning(f"Error counting postgres resumes: {str(e)}")
                 counts["postgres"] = None
@@ -393,6 +405,9 @@ async def send_test_email(request: TestEmailRequest):
         recipients = None
         if request.recipient:
             recipients = [request.recipient]
+        
+        # Format the timestamp once for both the HTML and text bodies
+        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
         # Create HTML and text content
         html_content = f"""
@@ -418,7 +433,7 @@ async def send_test_email(request: TestEmailRequest):
                 </ul>
                 <div class="footer">
                     <p>This is an automated test message from ResumeAI.</p>
-                    <p>Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+                    <p>Time: {now_str}</p>
                 </div>
             </div>
         </body>
@@ -439,11 +454,11 @@ async def send_test_email(request: TestEmailRequest):
         - SMTP Host: {email_service.config.smtp_host}
         
         This is an automated test message from ResumeAI.
-        Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        Time: {now_str}
         """
         
         # Send email
-        success = email_service.send_email(
+        success = await email_service.send_email_async(
             subject=subject,
             recipients=recipients,
             html_content=html_content,
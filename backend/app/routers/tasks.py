@@ -20,6 +20,14 @@ logger = logging.getLogger(__name__)
 # Define tasks storage path - using a JSON file for simplicity
 TASKS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "tasks.json")
 
+# Sort rank per priority (most urgent first), built once instead of per request
+PRIORITY_SORT_RANK = {
+    TaskPriority.CRITICAL: 0,
+    TaskPriority.HIGH: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.LOW: 3
+}
+
 # Create router
 router = APIRouter()
 
@@ -113,15 +121,8 @@ async def get_tasks(
             filtered_tasks = [t for t in filtered_tasks if t.priority == priority]
         
         # Sort by priority (high to low) and then created date (newest first)
-        priority_order = {
-            TaskPriority.CRITICAL: 0,
-            TaskPriority.HIGH: 1,
-            TaskPriority.MEDIUM: 2,
-            TaskPriority.LOW: 3
-        }
-        
         filtered_tasks.sort(key=lambda t: (
-            priority_order.get(t.priority, 999), 
+            PRIORITY_SORT_RANK.get(t.priority, 999), 
             -t.created_at.timestamp()
         ))
         
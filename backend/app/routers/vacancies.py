@@ -4,17 +4,30 @@ Vacancies API Router
 This module provides API endpoints for managing vacancy data.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Header, Response
 from typing import List, Optional, Any, Dict
 import logging
 import os
 import datetime
 import json
 import time
-from functools import lru_cache
-from fastapi.responses import JSONResponse
+import asyncio
+import base64
+from collections import OrderedDict
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from starlette.concurrency import run_in_threadpool
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard json module
+    orjson = None
+
+def dumps_json(value) -> str:
+    """Serialize a value to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
 # Helper function to process character-by-character JSON
 def process_match_toelichting(match_toelichting):
     """
@@ -23,33 +36,65 @@ def process_match_toelichting(match_toelichting):
     """
     if not match_toelichting:
         return match_toelichting
+    
+    # Plain strings are by far the most common case, return them before any dict checks
+    if isinstance(match_toelichting, str):
+        return match_toelichting
         
     # Check if it's a character-by-character object (dict with numeric keys)
     if isinstance(match_toelichting, dict) and len(match_toelichting) > 0:
-        # Check if keys are sequential numbers (0, 1, 2, ...)
-        keys = list(match_toelichting.keys())
-        if all(isinstance(key, str) and key.isdigit() for key in keys):
+        # Cheap check on the first key before scanning all of them, so regular
+        # JSON objects are rejected without walking the whole key set
+        first_key = next(iter(match_toelichting))
+        if (isinstance(first_key, str) and first_key.isdigit() and
+                all(isinstance(key, str) and key.isdigit() for key in match_toelichting)):
             try:
-                # Sort keys numerically and join characters
-                sorted_keys = sorted(keys, key=int)
-                combined_string = ''.join(match_toelichting[key] for key in sorted_keys)
+                # Keys are normally the contiguous indexes 0..n-1, so build the
+                # list of characters in order directly instead of sorting the keys
+                try:
+                    parts = [match_toelichting[str(i)] for i in range(len(match_toelichting))]
+                except KeyError:
+                    parts = [match_toelichting[key] for key in sorted(match_toelichting, key=int)]
+                combined_string = ''.join(parts)
                 
                 # Always return a string to maintain compatibility with the model
                 return combined_string
             except Exception as e:
-                logger.warning(f"Error processing character-by-character object: {e}")
+                logger.warning("Error processing character-by-character object: %s", e)
                 # Fall through to default handling
-                return json.dumps(match_toelichting) if isinstance(match_toelichting, dict) else str(match_toelichting)
+                return dumps_json(match_toelichting) if isinstance(match_toelichting, dict) else str(match_toelichting)
         else:
             # Not a character-by-character object, return as JSON string
-            return json.dumps(match_toelichting)
-    
-    # If it's already a string, return as-is
-    if isinstance(match_toelichting, str):
-        return match_toelichting
+            return dumps_json(match_toelichting)
     
     # For other types, convert to JSON string
-    return json.dumps(match_toelichting)
+    return dumps_json(match_toelichting)
+
+def apply_match_toelichting(vacancy: Dict[str, Any]) -> None:
+    """
+    Normalize the match details of a vacancy dict in place.
+    
+    Match_Toelichting (set by the database layer) is the canonical field; the
+    spelling with a space is only read when it is missing. The processed value
+    is stored under every spelling present, so the raw jsonb column no longer
+    carries the unprocessed (possibly character-by-character) object.
+    """
+    match_toelichting = vacancy.get("Match_Toelichting")
+    if match_toelichting is None:
+        match_toelichting = vacancy.get("Match Toelichting")
+    if not match_toelichting:
+        return
+    
+    processed_data = process_match_toelichting(match_toelichting)
+    
+    # Store the processed data in both field names for compatibility
+    vacancy["Match_Toelichting"] = processed_data
+    vacancy["Match Toelichting"] = processed_data
+    if "match_toelichting" in vacancy:
+        vacancy["match_toelichting"] = processed_data
+    
+    if processed_data != match_toelichting and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Successfully processed Match_Toelichting data")
 
 from app.db_interfaces.postgres import (
     get_all_vacancies, get_vacancy, create_vacancy, update_vacancy, delete_vacancy,
@@ -60,159 +105,418 @@ from app.models.vacancy import Vacancy, VacancyCreate, VacancyUpdate, VacancyLis
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Render responses with orjson when it is installed
+VacancyJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=VacancyJSONResponse)
+
+# Upper bound for the page size a client can request in one call
+MAX_LIMIT = 200
+
+# Columns of the vacancies table that the database returns as datetime values
+VACANCY_DATETIME_FIELDS = ("created_at", "updated_at", "geplaatst", "sluiting")
+
+# Defaults of the optional Vacancy fields, filled in on rows that lack them so
+# list pages can be serialized directly in the shape of the response model
+VACANCY_FIELD_DEFAULTS = {
+    name: field.get_default()
+    for name, field in Vacancy.model_fields.items()
+    if not field.is_required() and field.default_factory is None
+}
 
 # Cache variables
 CACHE_TTL_SECONDS = 60  # Cache expires after 60 seconds
-_vacancies_cache = {
-    "data": None,
-    "timestamp": 0,
-    "is_refreshing": False
-}
+CACHE_REFRESH_MARGIN_SECONDS = 5  # Background refresh runs this long before expiry
+CACHE_STALE_SECONDS = 300  # Expired data may still be served this long while it is refreshed
+# List cache: cache key -> {"data", "timestamp", "params", "accessed"}, one entry
+# per query, kept in LRU order and capped so rarely used filters don't pile up
+VACANCIES_CACHE_MAX_ENTRIES = 64
+_vacancies_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Single-vacancy cache: vacancy_id -> (timestamp, vacancy data), kept in LRU order
+VACANCY_CACHE_MAX_SIZE = 1024
+_vacancy_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# Futures of the database fetches currently refreshing the cache, by cache key,
+# shared by concurrent cache misses so only one of them queries the database
+_refresh_futures: Dict[str, asyncio.Future] = {}
+
+# Bumped on every write, so a fetch that read the database before the write
+# doesn't put its result back into the cache afterwards
+_vacancies_cache_generation = 0
 
 # Cache helper functions
-def get_cached_vacancies():
+def vacancies_cache_key(status: Optional[str], skip: int, limit: int, cursor: Optional[str] = None) -> str:
+    """Build the cache key for a vacancies page from its query parameters"""
+    return f"vacancies:list:{status}:{skip}:{limit}:{cursor}"
+
+def _get_vacancies_entry(key: str, max_age: float):
+    """Return the cached data for a key if it is younger than max_age, marking the entry as used"""
+    entry = _vacancies_cache.get(key)
+    if entry is None:
+        return None
+    current_time = time.time()
+    if current_time - entry["timestamp"] >= max_age:
+        return None
+    entry["accessed"] = current_time
+    _vacancies_cache.move_to_end(key)
+    return entry["data"]
+
+def get_cached_vacancies(key: str):
     """Get vacancies from cache if valid, otherwise return None"""
+    return _get_vacancies_entry(key, CACHE_TTL_SECONDS)
+
+def vacancies_cache_age(key: str) -> Optional[float]:
+    """Return how many seconds ago a cached page was fetched, or None if it isn't cached"""
+    entry = _vacancies_cache.get(key)
+    return None if entry is None else time.time() - entry["timestamp"]
+
+def get_stale_vacancies(key: str):
+    """Get expired-but-recent vacancies from cache for stale-while-revalidate, otherwise return None"""
+    return _get_vacancies_entry(key, CACHE_STALE_SECONDS)
+
+def set_cached_vacancies(key: str, data, params=None):
+    """Update the vacancies cache, evicting the least recently used page when full"""
     current_time = time.time()
-    if (_vacancies_cache["data"] is not None and 
-        current_time - _vacancies_cache["timestamp"] < CACHE_TTL_SECONDS):
-        return _vacancies_cache["data"]
-    return None
+    previous = _vacancies_cache.get(key)
+    _vacancies_cache[key] = {
+        "data": data,
+        "timestamp": current_time,
+        "params": params,
+        # A background refresh doesn't count as use of the page
+        "accessed": previous["accessed"] if previous is not None else current_time
+    }
+    _vacancies_cache.move_to_end(key)
+    if len(_vacancies_cache) > VACANCIES_CACHE_MAX_ENTRIES:
+        _vacancies_cache.popitem(last=False)
+
+def invalidate_vacancy_caches(vacancy_id: Optional[str] = None):
+    """Drop cached list data, and the cached vacancy itself when an ID is given, after a write"""
+    global _vacancies_cache_generation
+    _vacancies_cache_generation += 1
+    _vacancies_cache.clear()
+    # Fetches in flight read the data from before the write; later reads start
+    # a new fetch instead of joining them
+    _refresh_futures.clear()
+    if vacancy_id is not None:
+        _vacancy_cache.pop(str(vacancy_id), None)
+
+def get_cached_vacancy(vacancy_id: str):
+    """Get a single vacancy from cache if valid, otherwise return None"""
+    entry = _vacancy_cache.get(vacancy_id)
+    if entry is None:
+        return None
+    timestamp, data = entry
+    if time.time() - timestamp >= CACHE_TTL_SECONDS:
+        del _vacancy_cache[vacancy_id]
+        return None
+    _vacancy_cache.move_to_end(vacancy_id)
+    return data
+
+def set_cached_vacancy(vacancy_id: str, data):
+    """Store a single vacancy in the cache, evicting the least recently used entry when full"""
+    _vacancy_cache[vacancy_id] = (time.time(), data)
+    _vacancy_cache.move_to_end(vacancy_id)
+    if len(_vacancy_cache) > VACANCY_CACHE_MAX_SIZE:
+        _vacancy_cache.popitem(last=False)
 
-def set_cached_vacancies(data):
-    """Update the vacancies cache"""
-    _vacancies_cache["data"] = data
-    _vacancies_cache["timestamp"] = time.time()
-    _vacancies_cache["is_refreshing"] = False
+def encode_vacancy_cursor(key) -> Optional[str]:
+    """Encode a (created_at, id) keyset as an opaque cursor string"""
+    if key is None:
+        return None
+    created_at, vacancy_id = key
+    raw = f"{created_at.isoformat()}|{vacancy_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_vacancy_cursor(cursor: str):
+    """Decode a cursor string into a (created_at, id) keyset, raising ValueError if it is invalid"""
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    created_at, vacancy_id = raw.rsplit("|", 1)
+    return datetime.datetime.fromisoformat(created_at), int(vacancy_id)
+
+def _postprocess_vacancy(vacancy: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prepare a single vacancy row for the API in place and return it.
+    
+    Shared by the list, detail and update endpoints: converts the ID to a
+    string, formats datetime values as dates, normalizes the match details
+    and fills in the defaults of missing model fields.
+    """
+    # Convert integer IDs to strings to match model expectations
+    if "id" in vacancy and not isinstance(vacancy["id"], str):
+        vacancy["id"] = str(vacancy["id"])
+    
+    # Format the timestamp columns as dates; only these can hold datetimes,
+    # so there's no need to type-check every field of every row
+    for key in VACANCY_DATETIME_FIELDS:
+        value = vacancy.get(key)
+        if isinstance(value, datetime.datetime):
+            # Same YYYY-MM-DD output as strftime, without parsing a format string
+            vacancy[key] = value.date().isoformat()
+        elif isinstance(value, datetime.date):
+            vacancy[key] = value.isoformat()
+    
+    apply_match_toelichting(vacancy)
+    
+    for key, default in VACANCY_FIELD_DEFAULTS.items():
+        vacancy.setdefault(key, default)
+    return vacancy
+
+def _postprocess_page(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Prepare a page of vacancies in place and return it; runs once when rows enter the cache"""
+    for vacancy in rows:
+        _postprocess_vacancy(vacancy)
+    return rows
+
+def _fetch_vacancies_page(status: Optional[str], skip: int, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Fetch a page of vacancies from the database and post-process its rows (runs in a worker thread)"""
+    after = decode_vacancy_cursor(cursor) if cursor else None
+    result = get_all_vacancies(status, skip, limit, after)
+    
+    if not isinstance(result, dict):
+        # Handle old function signature return (just a list)
+        result = {"items": result, "total": len(result), "filtered_count": len(result)}
+    
+    # Post-process rows once here, so cache hits don't redo it per request
+    _postprocess_page(result.get("items", []))
+    result["next_cursor"] = encode_vacancy_cursor(result.pop("next_key", None))
+    return result
+
+async def refresh_cached_vacancies(status: Optional[str], skip: int, limit: int, cursor: Optional[str] = None):
+    """
+    Fetch vacancies from the database and update the cache (singleflight).
+    
+    If another request is already refreshing the same page, wait for that
+    fetch and return its result instead of querying the database again.
+    """
+    key = vacancies_cache_key(status, skip, limit, cursor)
+    
+    # No await between the check and the assignment, so this is race-free
+    in_flight = _refresh_futures.get(key)
+    if in_flight is not None:
+        logger.info("Another request is already refreshing %s, waiting for its result", key)
+        return await asyncio.shield(in_flight)
+    
+    future = asyncio.get_running_loop().create_future()
+    _refresh_futures[key] = future
+    generation = _vacancies_cache_generation
+    try:
+        # Run the synchronous database query and the CPU-bound row processing
+        # in the threadpool so neither blocks the event loop
+        result = await run_in_threadpool(_fetch_vacancies_page, status, skip, limit, cursor)
+        
+        # Update the cache with the fresh data, unless a write invalidated it
+        # while the query was running
+        if generation == _vacancies_cache_generation:
+            set_cached_vacancies(key, result, (status, skip, limit, cursor))
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved in case nobody else was waiting
+        future.exception()
+        raise
+    finally:
+        # An invalidation may already have dropped this future, and a newer
+        # fetch for the same page may have taken its place
+        if _refresh_futures.get(key) is future:
+            del _refresh_futures[key]
+
+def _dumps_row(row: Dict[str, Any]) -> bytes:
+    """Serialize a single vacancy row to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(row, default=str)
+    return json.dumps(row, default=str).encode()
+
+def stream_vacancy_list(items: List[Dict[str, Any]], total: int, total_all: Optional[int],
+                        next_cursor: Optional[str] = None):
+    """
+    Yield a VacancyList-shaped JSON document one row at a time.
+    
+    Only a single serialized row is held in memory at once instead of the
+    whole response body.
+    """
+    header = {"total": int(total), "total_all": None if total_all is None else int(total_all), "next_cursor": next_cursor}
+    yield json.dumps(header)[:-1].encode() + b',"items":['
+    for index, row in enumerate(items):
+        if index:
+            yield b","
+        yield _dumps_row(row)
+    yield b"]}"
+
+def vacancies_etag(status: Optional[str], skip: int, limit: int, cursor: Optional[str] = None) -> Optional[str]:
+    """
+    Build a weak ETag for a vacancies page from the cache timestamp and query parameters
+    
+    Returns None when the page isn't cached (evicted, or not stored because a
+    write happened during the fetch); without a timestamp two different
+    responses would share an ETag.
+    """
+    entry = _vacancies_cache.get(vacancies_cache_key(status, skip, limit, cursor))
+    if entry is None:
+        return None
+    timestamp_ms = int(entry["timestamp"] * 1000)
+    return f'W/"{timestamp_ms}-{skip}-{limit}-{status}-{cursor}"'
+
+# Background refresh tasks, referenced here so they aren't garbage collected while running
+_background_refreshes = set()
+
+def schedule_vacancies_refresh(status: Optional[str], skip: int, limit: int, cursor: Optional[str] = None):
+    """Start a background cache refresh unless one is already in flight for the page"""
+    if vacancies_cache_key(status, skip, limit, cursor) in _refresh_futures:
+        return
+    
+    async def _refresh():
+        try:
+            await refresh_cached_vacancies(status, skip, limit, cursor)
+        except Exception as e:
+            logger.error("Background refresh of vacancies cache failed: %s", e)
+    
+    task = asyncio.create_task(_refresh())
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+async def vacancy_cache_refresh_loop():
+    """
+    Keep the cached vacancy pages warm by refreshing them shortly before they expire.
+    
+    Started as a background task from the application lifespan, so requests
+    after the first one are served from cache instead of waiting on the database.
+    """
+    interval = max(1, CACHE_TTL_SECONDS - CACHE_REFRESH_MARGIN_SECONDS)
+    while True:
+        await asyncio.sleep(interval)
+        # Only refresh pages that were read since the last round; the rest expire
+        cutoff = time.time() - interval
+        for entry in [e for e in _vacancies_cache.values() if e["accessed"] >= cutoff]:
+            try:
+                await refresh_cached_vacancies(*entry["params"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Background refresh of vacancies cache failed: %s", e)
 
 @router.get("/", response_model=VacancyList)
 @router.get("", response_model=VacancyList)  # Add route without trailing slash
 async def get_vacancies(
-    skip: int = Query(0, description="Number of items to skip"),
-    limit: int = Query(10000, description="Number of items to return"),
+    skip: int = Query(0, ge=0, description="Number of items to skip; prefer cursor for later pages, which doesn't scan the skipped rows"),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT, description="Number of items to return"),
     status: Optional[str] = Query(None, description="Filter by status (None returns all statuses)"),
-    force_refresh: bool = Query(False, description="Force refresh from database")
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor; continues after that page instead of using skip"),
+    force_refresh: bool = Query(False, description="Force refresh from database"),
+    stream: bool = Query(False, description="Stream the response row by row instead of building it in memory"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get a list of vacancies with optional filtering and pagination.
     No default status filter, returns all vacancies. Sort is by Geplaatst date (newest first).
     Uses caching for better performance, with a 60-second TTL.
     """
+    if cursor:
+        try:
+            decode_vacancy_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # The cursor already positions the page, so skip doesn't apply
+        skip = 0
+    
     try:
         # Log the request
-        logger.info(f"Getting vacancies with skip={skip}, limit={limit}, status={status}, force_refresh={force_refresh}")
-        logger.info(f"Using PostgreSQL database")
+        logger.info("Getting vacancies with skip=%d, limit=%d, status=%s, cursor=%s, force_refresh=%s", skip, limit, status, cursor, force_refresh)
+        logger.info("Using PostgreSQL database")
         
         # Try to get from cache unless forced refresh
         all_vacancies = None
         if not force_refresh:
-            all_vacancies = get_cached_vacancies()
+            cache_key = vacancies_cache_key(status, skip, limit, cursor)
+            all_vacancies = get_cached_vacancies(cache_key)
+            if all_vacancies is not None:
+                # Refresh ahead of expiry, so the next request doesn't find the page expired
+                if vacancies_cache_age(cache_key) > CACHE_TTL_SECONDS - CACHE_REFRESH_MARGIN_SECONDS:
+                    schedule_vacancies_refresh(status, skip, limit, cursor)
+            else:
+                # Serve recently expired data right away and refresh it in the background
+                all_vacancies = get_stale_vacancies(cache_key)
+                if all_vacancies is not None:
+                    logger.info("Serving stale vacancies from cache while refreshing")
+                    schedule_vacancies_refresh(status, skip, limit, cursor)
             if all_vacancies:
-                logger.info(f"Retrieved {len(all_vacancies)} vacancies from cache")
-        
-        # Get vacancy statistics for quick counts without loading all data
-        vacancy_stats = None
-        try:
-            vacancy_stats = await run_in_threadpool(get_vacancy_statistics)
-            logger.info(f"Retrieved vacancy statistics: {vacancy_stats}")
-        except Exception as stats_error:
-            logger.error(f"Error fetching vacancy statistics: {str(stats_error)}")
-            # Continue without statistics, will fall back to calculating from vacancies
+                logger.info("Retrieved %d vacancies from cache", len(all_vacancies.get('items', [])))
         
         # If cache miss or forced refresh, fetch from database
         if all_vacancies is None:
-            # To avoid multiple simultaneous refreshes, check if already refreshing
-            if _vacancies_cache["is_refreshing"]:
-                logger.info("Another request is already refreshing the cache, using empty temporary result")
-                all_vacancies = {"items": [], "total": 0, "filtered_count": 0}
-            else:
-                _vacancies_cache["is_refreshing"] = True
-                logger.info("Cache miss or forced refresh, fetching from database")
-                
-                # Run the potentially blocking database operation
-                try:
-                    # Use run_in_threadpool for synchronous database operations
-                    result = await run_in_threadpool(
-                        lambda: get_all_vacancies(status, skip, limit)
-                    )
-                    
-                    if not isinstance(result, dict):
-                        # Handle old function signature return (just a list)
-                        all_vacancies = {"items": result, "total": len(result), "filtered_count": len(result)}
-                    else:
-                        # New function signature returns a dict with items, total, filtered_count
-                        all_vacancies = result
-                    
-                    # Update the cache with the fresh data
-                    set_cached_vacancies(all_vacancies)
-                    logger.info(f"Updated cache with {len(all_vacancies.get('items', []))} vacancies from database out of {all_vacancies.get('total', 0)} total")
-                except Exception as db_error:
-                    _vacancies_cache["is_refreshing"] = False
-                    logger.error(f"Error fetching vacancies from database: {str(db_error)}")
-                    raise
+            logger.info("Cache miss or forced refresh, fetching from database")
+            try:
+                all_vacancies = await refresh_cached_vacancies(status, skip, limit, cursor)
+                logger.info("Updated cache with %d vacancies from database out of %d total", len(all_vacancies.get('items', [])), all_vacancies.get('total', 0))
+            except Exception as db_error:
+                logger.error("Error fetching vacancies from database: %s", db_error)
+                raise
         
-        # Get total counts from the database result or from statistics
-        total_all_statuses = all_vacancies.get('total') if isinstance(all_vacancies, dict) else 0
-        if total_all_statuses == 0 and vacancy_stats:
-            total_all_statuses = vacancy_stats.get('total', 0)
-            
-        # Get the vacancies items from the database result
-        vacancies_items = all_vacancies.get('items', []) if isinstance(all_vacancies, dict) else []
+        # Let clients revalidate against the cache timestamp and skip the body if unchanged
+        etag = vacancies_etag(status, skip, limit, cursor)
+        # no-cache lets clients keep the page but makes them revalidate it every time
+        cache_headers = {"Cache-Control": "no-cache"}
+        if etag is not None:
+            cache_headers["ETag"] = etag
+            if if_none_match == etag:
+                return Response(status_code=304, headers=cache_headers)
         
-        # Get total filtered count from the database result or from statistics
-        if status and vacancy_stats:
-            total_filtered = vacancy_stats.get(status, 0)
-        else:
-            total_filtered = total_all_statuses
+        # The database query already filtered, sorted and paginated the rows and
+        # counted both the filtered set and all statuses in the same round trip
+        vacancies_items = all_vacancies.get('items', [])
+        total_filtered = all_vacancies.get('total', 0)
+        total_all_statuses = all_vacancies.get('total_all')
+        
+        # Only query the statistics when the result is missing the overall count,
+        # so cache hits don't cost a database round trip
+        if total_all_statuses is None:
+            vacancy_stats = None
+            try:
+                vacancy_stats = await run_in_threadpool(get_vacancy_statistics)
+                logger.info("Retrieved vacancy statistics: %s", vacancy_stats)
+            except Exception as stats_error:
+                logger.error("Error fetching vacancy statistics: %s", stats_error)
+                # Continue without statistics, fall back to the filtered count
+            total_all_statuses = vacancy_stats.get('total', 0) if vacancy_stats else total_filtered
         
         # We're not doing additional sorting here since the database query is already sorted by created_at DESC
         # Just use the vacancies as they come from the database
         sorted_vacancies = vacancies_items
-        logger.info(f"Using database sort order (created_at DESC)")
+        logger.info("Using database sort order (created_at DESC)")
         
         # No need to apply pagination here as it's already done in the database query
         # Log the number of vacancies we have
-        logger.info(f"Retrieved {len(sorted_vacancies)} vacancies (skip={skip}, limit={limit}, total_filtered={total_filtered})")
+        logger.info("Retrieved %d vacancies (skip=%d, limit=%d, total_filtered=%d)", len(sorted_vacancies), skip, limit, total_filtered)
         
-        # Convert integer IDs to strings to match model expectations
-        for vacancy in sorted_vacancies:
-            if "id" in vacancy and not isinstance(vacancy["id"], str):
-                vacancy["id"] = str(vacancy["id"])
-            
-            # Check for both versions of field name (with and without underscore)
-            match_toelichting = vacancy.get("Match Toelichting") or vacancy.get("Match_Toelichting")
-            
-            # Process and store match details in both field names for compatibility
-            if match_toelichting:
-                # Use our helper function to process the match_toelichting
-                processed_data = process_match_toelichting(match_toelichting)
-                
-                # Store the processed data in both field names
-                vacancy["Match Toelichting"] = processed_data
-                vacancy["Match_Toelichting"] = processed_data
-                
-                if processed_data != match_toelichting:
-                    logger.info("Successfully processed Match_Toelichting data")
+        if stream:
+            logger.info("Streaming %d vacancies with total_filtered=%d, total_all=%s", len(sorted_vacancies), total_filtered, total_all_statuses)
+            return StreamingResponse(
+                stream_vacancy_list(sorted_vacancies, total_filtered, total_all_statuses, all_vacancies.get('next_cursor')),
+                media_type="application/json",
+                headers=cache_headers
+            )
         
-        # Fix any datetime objects before returning
-        for vacancy in sorted_vacancies:
-            for key, value in vacancy.items():
-                if isinstance(value, datetime.datetime):
-                    vacancy[key] = value.strftime("%Y-%m-%d")
+        # Return response with both total counts. The rows were already shaped
+        # like VacancyList when they were cached, so serialize them directly
+        # instead of re-validating every row through the model on each request
+        logger.info("Returning %d vacancies with total_filtered=%d, total_all=%s", len(sorted_vacancies), total_filtered, total_all_statuses)
         
-        # Return response with both total counts
-        response = VacancyList(
-            items=sorted_vacancies, 
-            total=total_filtered,
-            total_all=total_all_statuses
+        return VacancyJSONResponse(
+            content={
+                "items": sorted_vacancies,
+                "total": int(total_filtered),
+                "total_all": None if total_all_statuses is None else int(total_all_statuses),
+                "next_cursor": all_vacancies.get('next_cursor')
+            },
+            headers=cache_headers
         )
-            
-        logger.info(f"Returning {len(sorted_vacancies)} vacancies with total_filtered={total_filtered}, total_all={total_all_statuses}")
-        
-        return response
     except Exception as e:
-        logger.error(f"Error getting vacancies: {str(e)}", exc_info=True)
+        logger.error("Error getting vacancies: %s", e, exc_info=True)
         
         # Create a more detailed error message
         error_type = type(e).__name__
@@ -228,7 +532,7 @@ async def get_vacancies(
         else:
             message = f"Error getting vacancies: {error_type} - {error_details}"
         
-        logger.error(f"Returning error to client: {message}")
+        logger.error("Returning error to client: %s", message)
         raise HTTPException(status_code=500, detail=message)
 
 # Define helper functions for catching errors in direct PostgreSQL operations
@@ -246,7 +550,7 @@ def handle_db_error(e, operation):
     else:
         message = f"Error during {operation}: {error_type} - {error_details}"
     
-    logger.error(f"Database error: {message}")
+    logger.error("Database error: %s", message)
     return message
 
 @router.get("/{vacancy_id}")  # Remove response_model for debugging
@@ -258,54 +562,27 @@ async def get_vacancy_endpoint(
     Uses caching for better performance.
     """
     try:
+        cached_vacancy = get_cached_vacancy(vacancy_id)
+        if cached_vacancy is not None:
+            return cached_vacancy
+        
         # Use run_in_threadpool for the synchronous database operation
         vacancy_data = await run_in_threadpool(lambda: get_vacancy(vacancy_id))
         if not vacancy_data:
             raise HTTPException(status_code=404, detail=f"Vacancy with ID {vacancy_id} not found")
         
-        # Convert datetime objects to strings and ensure ID is a string
-        for key, value in vacancy_data.items():
-            if isinstance(value, datetime.datetime):
-                vacancy_data[key] = value.strftime("%Y-%m-%d")
-            elif key == 'id' and not isinstance(value, str):
-                vacancy_data[key] = str(value)
-        
-        # Check for both versions of field name (with and without underscore)
-        match_toelichting = vacancy_data.get("Match Toelichting") or vacancy_data.get("Match_Toelichting")
-        
-        # Process and store match details in both field names for compatibility
-        if match_toelichting:
-            # Use our helper function to process the match_toelichting
-            processed_data = process_match_toelichting(match_toelichting)
-            
-            # Store the processed data in both field names
-            vacancy_data["Match Toelichting"] = processed_data
-            vacancy_data["Match_Toelichting"] = processed_data
-            
-            if processed_data != match_toelichting:
-                logger.info("Successfully processed Match_Toelichting data")
-        
-        # Add debugging log
-        logger.info(f"Returning vacancy data: {vacancy_data}")
+        # Same conversion as list pages: string ID, dates and processed match details
+        _postprocess_vacancy(vacancy_data)
         
-        # Make sure we have all required fields
-        required_fields = ["URL", "id", "Status"]
-        for field in required_fields:
-            if field not in vacancy_data:
-                logger.error(f"Required field '{field}' missing from vacancy data")
-                # Add fallback values for critical fields
-                if field == "URL":
-                    vacancy_data[field] = "unknown-url"
-                elif field == "id":
-                    vacancy_data[field] = str(vacancy_id)
-                elif field == "Status":
-                    vacancy_data[field] = "Unknown"
+        # Log the ID only; the full row can hold a long match explanation
+        logger.info("Returning vacancy %s", vacancy_id)
         
+        set_cached_vacancy(vacancy_id, vacancy_data)
         return vacancy_data
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting vacancy {vacancy_id}: {str(e)}")
+        logger.error("Error getting vacancy %s: %s", vacancy_id, e)
         raise HTTPException(status_code=500, detail=f"Error getting vacancy: {str(e)}")
 
 @router.post("/", response_model=Vacancy, status_code=201)
@@ -319,11 +596,15 @@ async def create_vacancy_endpoint(
         # Convert Pydantic model to dict
         vacancy_data = vacancy.model_dump()
         
+        # Store match details in their processed form, so reads don't redo the work
+        apply_match_toelichting(vacancy_data)
+        
         # Create the vacancy using run_in_threadpool for synchronous database operation
         created_vacancy = await run_in_threadpool(lambda: create_vacancy(vacancy_data))
+        invalidate_vacancy_caches()
         return created_vacancy
     except Exception as e:
-        logger.error(f"Error creating vacancy: {str(e)}")
+        logger.error("Error creating vacancy: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating vacancy: {str(e)}")
 
 @router.put("/{vacancy_id}", response_model=Vacancy)
@@ -335,21 +616,25 @@ async def update_vacancy_endpoint(
     Update an existing vacancy.
     """
     try:
-        # Check if vacancy exists using run_in_threadpool
-        existing_vacancy = await run_in_threadpool(lambda: get_vacancy(vacancy_id))
-        if not existing_vacancy:
-            raise HTTPException(status_code=404, detail=f"Vacancy with ID {vacancy_id} not found")
+        # Only update the fields the client actually sent; explicit nulls clear a field
+        update_data = vacancy.model_dump(exclude_unset=True)
         
-        # Convert Pydantic model to dict and filter out None values
-        update_data = {k: v for k, v in vacancy.model_dump().items() if v is not None}
+        # Store match details in their processed form, so reads don't redo the work
+        apply_match_toelichting(update_data)
         
         # Update the vacancy using run_in_threadpool
+        # The update itself reports a missing vacancy and returns the updated row,
+        # no separate existence check or re-read needed
         updated_vacancy = await run_in_threadpool(lambda: update_vacancy(vacancy_id, update_data))
-        return updated_vacancy
+        if updated_vacancy is None:
+            raise HTTPException(status_code=404, detail=f"Vacancy with ID {vacancy_id} not found")
+        
+        invalidate_vacancy_caches(vacancy_id)
+        return _postprocess_vacancy(updated_vacancy)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating vacancy {vacancy_id}: {str(e)}")
+        logger.error("Error updating vacancy %s: %s", vacancy_id, e)
         raise HTTPException(status_code=500, detail=f"Error updating vacancy: {str(e)}")
 
 @router.delete("/{vacancy_id}", status_code=204)
@@ -360,19 +645,18 @@ async def delete_vacancy_endpoint(
     Delete a vacancy.
     """
     try:
-        # Check if vacancy exists
-        existing_vacancy = await run_in_threadpool(lambda: get_vacancy(vacancy_id))
-        if not existing_vacancy:
+        # Delete the vacancy, which reports a missing vacancy as None
+        success = await run_in_threadpool(lambda: delete_vacancy(vacancy_id))
+        if success is None:
             raise HTTPException(status_code=404, detail=f"Vacancy with ID {vacancy_id} not found")
         
-        # Delete the vacancy
-        success = await run_in_threadpool(lambda: delete_vacancy(vacancy_id))
+        invalidate_vacancy_caches(vacancy_id)
         if not success:
             raise HTTPException(status_code=500, detail=f"Failed to delete vacancy {vacancy_id}")
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting vacancy {vacancy_id}: {str(e)}")
+        logger.error("Error deleting vacancy %s: %s", vacancy_id, e)
         raise HTTPException(status_code=500, detail=f"Error deleting vacancy: {str(e)}")
 
 @router.get("/stats", status_code=200)
@@ -389,7 +673,7 @@ async def get_statistics_endpoint():
             "statistics": stats
         }
     except Exception as e:
-        logger.error(f"Error getting vacancy statistics: {str(e)}")
+        logger.error("Error getting vacancy statistics: %s", e)
         raise HTTPException(status_code=500, detail=f"Error getting vacancy statistics: {str(e)}")
         
 @router.post("/rebuild-stats", status_code=200)
@@ -415,5 +699,5 @@ async def rebuild_statistics_endpoint():
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error rebuilding vacancy statistics: {str(e)}")
+        logger.error("Error rebuilding vacancy statistics: %s", e)
         raise HTTPException(status_code=500, detail=f"Error rebuilding vacancy statistics: {str(e)}")
\ No newline at end of file
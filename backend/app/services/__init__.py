@@ -1,6 +1,6 @@
 # This file marks the directory as a Python package
 
 # Import services for easy access
-from app.services.database_service import db_service
+from app.services.database_service import get_db_service
 from app.services.scheduler_service import scheduler_service
 from app.services.email_service import email_service
\ No newline at end of file
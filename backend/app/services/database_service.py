@@ -12,8 +12,15 @@ License: MIT
 Repository: https://github.com/DanielTromp/ResumeAI
 """
 
-import os
+import time
+import asyncio
+import functools
+import hashlib
 import logging
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
 import psycopg2
 import psycopg2.extras
 from typing import List, Dict, Any, Optional, Union, Tuple
@@ -22,31 +29,208 @@ from app.config import (
     PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DATABASE, POSTGRES_RESUME_TABLE,
     MATCH_THRESHOLD, MATCH_COUNT, RESUME_RPC_FUNCTION_NAME
 )
+from app.db_interfaces.postgres import get_connection, release_connection
+from app.db_init import HALFVEC_INDEX_NAME, rebuild_embedding_index
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# One row per candidate resume (name, filename, chunk_count), maintained by a
+# trigger on the resumes table, see db_init
+RESUME_META_TABLE = "resumes_meta"
+
+# Dimensions of the stored embeddings, see the resumes table in db_init
+EMBEDDING_DIMENSIONS = 1536
+
+# With pgvector 0.7+ db_init indexes the embeddings as half precision, which
+# halves the index size. Matches then take this many times the requested count
+# as candidates from that index and rank them at full precision.
+HALFVEC_CANDIDATE_FACTOR = 2
+
+def _match_query(embedding: str, threshold: str, count: str, halfvec: bool) -> str:
+    """
+    Build the top-k match query for one embedding, with the SQL expressions
+    for its parameters filled in.
+    
+    Both forms order by the raw distance with a LIMIT, the shape the HNSW
+    index can serve; the half precision form must repeat the indexed
+    expression exactly for the planner to use it.
+    """
+    if not halfvec:
+        return f"""
+            SELECT name, cv_chunk, embedding <=> {embedding} AS distance
+            FROM {POSTGRES_RESUME_TABLE}
+            WHERE embedding <=> {embedding} < 1 - {threshold}
+            ORDER BY embedding <=> {embedding}
+            LIMIT {count}
+        """
+    return f"""
+        SELECT name, cv_chunk, embedding <=> {embedding} AS distance
+        FROM (
+            SELECT name, cv_chunk, embedding
+            FROM {POSTGRES_RESUME_TABLE}
+            ORDER BY embedding::halfvec({EMBEDDING_DIMENSIONS}) <=> {embedding}::halfvec({EMBEDDING_DIMENSIONS})
+            LIMIT {count} * {HALFVEC_CANDIDATE_FACTOR}
+        ) AS candidates
+        WHERE embedding <=> {embedding} < 1 - {threshold}
+        ORDER BY embedding <=> {embedding}
+        LIMIT {count}
+    """
+
+# The vector match query, prepared once per connection so PostgreSQL parses
+# and plans it once instead of on every search. The table name comes from
+# config, so the SQL is built here at import time rather than per call, in
+# both forms, keyed by whether the half precision index is used.
+MATCH_STATEMENT_NAME = "resume_vector_match"
+_PREPARE_MATCH_SQL = {
+    halfvec: f"""
+        PREPARE {MATCH_STATEMENT_NAME} (vector, double precision, integer) AS
+        SELECT name, cv_chunk, 1 - distance AS similarity
+        FROM ({_match_query("$1", "$2", "$3", halfvec)}) AS matches
+        ORDER BY distance
+    """
+    for halfvec in (False, True)
+}
+_EXECUTE_MATCH_SQL = f"EXECUTE {MATCH_STATEMENT_NAME} (%s::vector, %s, %s)"
+
+# The same match for several embeddings in one round trip: the embeddings are
+# sent as one vector array and each runs the single-embedding query through a
+# LATERAL join, tagged with its position in the array
+_BATCH_MATCH_SQL = {
+    halfvec: f"""
+        SELECT q.qid, m.name, m.cv_chunk, 1 - m.distance AS similarity
+        FROM unnest(%(embeddings)s::vector[]) WITH ORDINALITY AS q(query_embedding, qid)
+        CROSS JOIN LATERAL ({_match_query("q.query_embedding", "%(threshold)s", "%(count)s", halfvec)}) AS m
+        ORDER BY q.qid, m.distance
+    """
+    for halfvec in (False, True)
+}
+_HALFVEC_INDEX_REGCLASS = f"public.{HALFVEC_INDEX_NAME}"
+
+# The remaining resume queries, built once since the table names are fixed
+# for the life of the process
+_INSERT_RESUME_SQL = f"""
+    INSERT INTO {POSTGRES_RESUME_TABLE} (name, filename, cv_chunk, embedding)
+    VALUES (%s, %s, %s, %s::vector)
+"""
+_INSERT_RESUMES_SQL = f"INSERT INTO {POSTGRES_RESUME_TABLE} (name, filename, cv_chunk, embedding) VALUES %s"
+_INSERT_RESUMES_TEMPLATE = "(%s, %s, %s, %s::vector)"
+_DELETE_RESUME_SQL = f"DELETE FROM {POSTGRES_RESUME_TABLE} WHERE filename = %s"
+_LIST_RESUMES_SQL = f"SELECT name, filename FROM {RESUME_META_TABLE} ORDER BY name"
+_COUNT_RESUMES_SQL = f"SELECT COUNT(DISTINCT name) FROM {RESUME_META_TABLE}"
+_PROBE_RESUMES_SQL = f"SELECT 1 FROM {POSTGRES_RESUME_TABLE} LIMIT 1"
+_RESUME_TABLE_REGCLASS = f"public.{POSTGRES_RESUME_TABLE}"
+
+# How long a connection status check is reused, so frequent health probes
+# don't each run queries against the database
+STATUS_CACHE_TTL_SECONDS = 5
+
+def to_vector_literal(embedding: List[float]) -> str:
+    """
+    Format an embedding as a pgvector text literal ("[0.1,0.2,...]").
+    
+    psycopg2 only speaks the text protocol, and adapts a Python list as an
+    ARRAY[...] expression that PostgreSQL parses into a numeric array and then
+    casts to vector. A single literal skips both the per-element adaptation
+    and the numeric array round trip.
+    """
+    return "[" + ",".join(map(str, embedding)) + "]"
+
+# Pooled connections the match statement has been prepared on; prepared
+# statements live as long as the connection, and closed connections drop out
+_match_prepared_connections = weakref.WeakSet()
+
+# Match cache: (embedding digest, threshold, count, resumes version) ->
+# (timestamp, matches), kept in LRU order. Searches for the same job
+# description repeat within seconds, so recent results are reused instead of
+# scanning the resume embeddings again. Bumping the version on add/delete
+# retires every cached result; writes made outside this service are picked up
+# once the TTL runs out.
+MATCH_CACHE_TTL_SECONDS = 60
+MATCH_CACHE_MAX_SIZE = 1024
+_match_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_match_cache_version = 0
+# Matches are looked up from worker threads, so the cache is guarded by a lock
+_match_cache_lock = threading.Lock()
+
+def _match_cache_key(vector_literal: str, threshold: float, count: int) -> tuple:
+    """Build the match cache key, hashing the embedding so keys stay small"""
+    digest = hashlib.blake2b(vector_literal.encode(), digest_size=16).digest()
+    return (digest, threshold, count, _match_cache_version)
+
+def get_cached_matches(key: tuple) -> Optional[List[Dict[str, Any]]]:
+    """Get cached matches if valid, otherwise return None"""
+    with _match_cache_lock:
+        entry = _match_cache.get(key)
+        if entry is None:
+            return None
+        timestamp, matches = entry
+        if time.time() - timestamp >= MATCH_CACHE_TTL_SECONDS:
+            del _match_cache[key]
+            return None
+        _match_cache.move_to_end(key)
+    # Callers get their own list; the rows are shared and must not be modified
+    return list(matches)
+
+def set_cached_matches(key: tuple, matches: List[Dict[str, Any]]):
+    """Store matches in the cache, evicting the least recently used entry when full"""
+    with _match_cache_lock:
+        _match_cache[key] = (time.time(), tuple(matches))
+        _match_cache.move_to_end(key)
+        if len(_match_cache) > MATCH_CACHE_MAX_SIZE:
+            _match_cache.popitem(last=False)
+
+def invalidate_match_cache():
+    """Retire all cached matches after the resumes change"""
+    global _match_cache_version
+    with _match_cache_lock:
+        _match_cache_version += 1
+        _match_cache.clear()
+
 class DatabaseService:
     """Service to handle PostgreSQL database backend"""
     
     def __init__(self):
         """Initialize the database service"""
         logger.info("Initializing DatabaseService for PostgreSQL")
+        # Set once the resumes table is known to exist; it isn't dropped at
+        # runtime, so later calls skip the lookup. A missing table is checked
+        # again, so one created afterwards is picked up.
+        self._table_exists: Optional[bool] = None
+        # Whether the half precision embedding index exists, looked up on the
+        # first match (after db_init has run at startup)
+        self._use_halfvec: Optional[bool] = None
+        # Last connection status check: (timestamp, status)
+        self._status_cache: Optional[Tuple[float, Dict[str, bool]]] = None
+    
+    def _ensure_table(self, cursor) -> bool:
+        """Return whether the resumes table exists, looking it up only until it does"""
+        if not self._table_exists:
+            cursor.execute("SELECT to_regclass(%s)", (_RESUME_TABLE_REGCLASS,))
+            self._table_exists = cursor.fetchone()[0] is not None
+        return self._table_exists
+    
+    def _halfvec_enabled(self, cursor) -> bool:
+        """Return whether matches should go through the half precision index"""
+        if self._use_halfvec is None:
+            cursor.execute("SELECT to_regclass(%s)", (_HALFVEC_INDEX_REGCLASS,))
+            self._use_halfvec = cursor.fetchone()["to_regclass"] is not None
+        return self._use_halfvec
     
-    def get_postgres_connection(self):
-        """Get a PostgreSQL connection"""
+    @contextmanager
+    def connection(self):
+        """
+        Check a PostgreSQL connection out of the shared pool for a block.
+        
+        The connection goes back to the pool afterwards (rolled back if a
+        transaction is still open), instead of paying for a new connection,
+        and its handshake, on every call.
+        """
+        conn = get_connection()
         try:
-            conn = psycopg2.connect(
-                host=PG_HOST,
-                port=PG_PORT,
-                user=PG_USER,
-                password=PG_PASSWORD,
-                database=PG_DATABASE
-            )
-            return conn
-        except Exception as e:
-            logger.error(f"❌ Error connecting to PostgreSQL: {str(e)}")
-            raise e
+            yield conn
+        finally:
+            release_connection(conn)
     
     def get_vector_matches(self, embedding: List[float], threshold: float = MATCH_THRESHOLD, 
                            count: int = MATCH_COUNT) -> List[Dict[str, Any]]:
@@ -59,43 +243,98 @@ class DatabaseService:
             count: Maximum number of matches to return
             
         Returns:
-            List of matches with name, cv_chunk, and similarity
+            List of matches with name, cv_chunk, and similarity. The match
+            dictionaries are shared with the match cache; copy one before
+            modifying it.
         """
         return self._get_postgres_matches(embedding, threshold, count)
     
+    async def get_vector_matches_async(self, embedding: List[float], threshold: float = MATCH_THRESHOLD,
+                                       count: int = MATCH_COUNT) -> List[Dict[str, Any]]:
+        """
+        Get vector matches from PostgreSQL without blocking the event loop
+        
+        Runs get_vector_matches in a worker thread, for callers inside a
+        coroutine (such as the vacancy spider) where the synchronous query
+        would stall every other task on the loop while it runs.
+        """
+        return await asyncio.to_thread(self.get_vector_matches, embedding, threshold, count)
+    
+    def get_vector_matches_batch(self, embeddings: List[List[float]], threshold: float = MATCH_THRESHOLD,
+                                 count: int = MATCH_COUNT) -> List[List[Dict[str, Any]]]:
+        """
+        Get vector matches from PostgreSQL for several embeddings at once
+        
+        Embeddings without cached results are matched in a single query
+        instead of one round trip each.
+        
+        Args:
+            embeddings: The embedding vectors to match against
+            threshold: The similarity threshold (0-1)
+            count: Maximum number of matches to return per embedding
+            
+        Returns:
+            One list of matches per embedding, in the order of the embeddings;
+            the match dictionaries are shared with the match cache as well
+        """
+        return self._get_postgres_matches_batch(embeddings, threshold, count)
+    
     def _get_postgres_matches(self, embedding: List[float], threshold: float, count: int) -> List[Dict[str, Any]]:
-        """Get matches from PostgreSQL"""
-        conn = None
-        cursor = None
+        """Get matches from PostgreSQL, reusing recent results for the same embedding"""
+        vector_literal = to_vector_literal(embedding)
+        cache_key = _match_cache_key(vector_literal, threshold, count)
+        cached_matches = get_cached_matches(cache_key)
+        if cached_matches is not None:
+            return cached_matches
+        
         try:
-            conn = self.get_postgres_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-            
-            # Execute direct query for better reliability
-            query = f"""
-                SELECT name, cv_chunk, 1 - (embedding <=> %s::vector) AS similarity
-                FROM {POSTGRES_RESUME_TABLE}
-                WHERE 1 - (embedding <=> %s::vector) > %s
-                ORDER BY similarity DESC
-                LIMIT %s
-            """
-            
-            cursor.execute(query, (embedding, embedding, threshold, count))
-            results = cursor.fetchall()
+            with self.connection() as conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                if conn not in _match_prepared_connections:
+                    cursor.execute(_PREPARE_MATCH_SQL[self._halfvec_enabled(cursor)])
+                    _match_prepared_connections.add(conn)
+                
+                # The prepared statement references the embedding as $1 in every
+                # place, so it is only sent once
+                cursor.execute(_EXECUTE_MATCH_SQL, (vector_literal, threshold, count))
+                # RealDictCursor rows are already plain dictionaries
+                matches = cursor.fetchall()
             
-            # Convert psycopg2 DictRow objects to regular dictionaries
-            return [dict(row) for row in results]
+            set_cached_matches(cache_key, matches)
+            return matches
         except Exception as e:
+            # The pool rolls back the failed transaction when the connection is returned
             logger.error(f"❌ Error getting matches from PostgreSQL: {str(e)}")
-            if conn:
-                conn.rollback()  # Always rollback on exception to clear transaction state
             return []
-        finally:
-            # Always close cursor and connection in finally block
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+    
+    def _get_postgres_matches_batch(self, embeddings: List[List[float]], threshold: float,
+                                    count: int) -> List[List[Dict[str, Any]]]:
+        """Get matches for several embeddings from PostgreSQL in one query"""
+        vector_literals = [to_vector_literal(embedding) for embedding in embeddings]
+        cache_keys = [_match_cache_key(literal, threshold, count) for literal in vector_literals]
+        batch_matches = [get_cached_matches(key) for key in cache_keys]
+        missing = [i for i, matches in enumerate(batch_matches) if matches is None]
+        if not missing:
+            return batch_matches
+        
+        for i in missing:
+            batch_matches[i] = []
+        try:
+            with self.connection() as conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                cursor.execute(_BATCH_MATCH_SQL[self._halfvec_enabled(cursor)], {
+                    "embeddings": [vector_literals[i] for i in missing],
+                    "threshold": threshold,
+                    "count": count
+                })
+                for row in cursor.fetchall():
+                    # qid is the 1-based position in the array of missing embeddings
+                    batch_matches[missing[row.pop("qid") - 1]].append(row)
+            
+            for i in missing:
+                set_cached_matches(cache_keys[i], batch_matches[i])
+        except Exception as e:
+            logger.error(f"❌ Error getting batch matches from PostgreSQL: {str(e)}")
+        
+        return batch_matches
     
     def add_resume(self, name: str, filename: str, cv_chunk: str, embedding: List[float]) -> bool:
         """
@@ -114,32 +353,55 @@ class DatabaseService:
     
     def _add_resume_postgres(self, name: str, filename: str, cv_chunk: str, embedding: List[float]) -> bool:
         """Add a resume chunk to PostgreSQL"""
-        conn = None
-        cursor = None
         try:
-            conn = self.get_postgres_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                f"""
-                INSERT INTO {POSTGRES_RESUME_TABLE} (name, filename, cv_chunk, embedding) 
-                VALUES (%s, %s, %s, %s::vector)
-                """,
-                (name, filename, cv_chunk, embedding)
-            )
-            
-            conn.commit()
+            with self.connection() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    _INSERT_RESUME_SQL,
+                    (name, filename, cv_chunk, to_vector_literal(embedding))
+                )
+                
+                conn.commit()
+            invalidate_match_cache()
             return True
         except Exception as e:
             logger.error(f"❌ Error adding resume to PostgreSQL: {str(e)}")
-            if conn:
-                conn.rollback()
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+    
+    def add_resume_batch(self, rows: List[Tuple[str, str, str, List[float]]]) -> bool:
+        """
+        Add several resume chunks to the database in one statement
+        
+        Args:
+            rows: (name, filename, cv_chunk, embedding) tuples
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._add_resume_batch_postgres(rows)
+    
+    def _add_resume_batch_postgres(self, rows: List[Tuple[str, str, str, List[float]]]) -> bool:
+        """Add resume chunks to PostgreSQL, committing once for the whole batch"""
+        if not rows:
+            return True
+        try:
+            with self.connection() as conn, conn.cursor() as cursor:
+                psycopg2.extras.execute_values(
+                    cursor,
+                    _INSERT_RESUMES_SQL,
+                    [
+                        (name, filename, cv_chunk, to_vector_literal(embedding))
+                        for name, filename, cv_chunk, embedding in rows
+                    ],
+                    template=_INSERT_RESUMES_TEMPLATE,
+                    page_size=500
+                )
+                
+                conn.commit()
+            invalidate_match_cache()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error adding resume chunks to PostgreSQL: {str(e)}")
+            return False
     
     def delete_resume(self, filename: str) -> bool:
         """
@@ -155,32 +417,38 @@ class DatabaseService:
     
     def _delete_resume_postgres(self, filename: str) -> bool:
         """Delete a resume from PostgreSQL"""
-        conn = None
-        cursor = None
         try:
-            conn = self.get_postgres_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                f"""
-                DELETE FROM {POSTGRES_RESUME_TABLE} 
-                WHERE filename = %s
-                """,
-                (filename,)
-            )
-            
-            conn.commit()
+            with self.connection() as conn, conn.cursor() as cursor:
+                cursor.execute(_DELETE_RESUME_SQL, (filename,))
+                # The affected row count says how many chunks went, without
+                # sending their IDs back or counting them first
+                deleted_chunks = cursor.rowcount
+                
+                conn.commit()
+            logger.info(f"Deleted {deleted_chunks} chunks of {filename} from PostgreSQL")
+            invalidate_match_cache()
             return True
         except Exception as e:
             logger.error(f"❌ Error deleting resume from PostgreSQL: {str(e)}")
-            if conn:
-                conn.rollback()
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+    
+    def rebuild_index(self) -> bool:
+        """
+        Rebuild the embedding index, e.g. after a bulk load of resumes
+        
+        See rebuild_embedding_index in db_init, which the resume manager also
+        runs after a bulk upload.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.connection() as conn:
+                rebuild_embedding_index(conn)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error rebuilding embedding index in PostgreSQL: {str(e)}")
+            return False
     
     def list_resumes(self) -> List[Dict[str, str]]:
         """
@@ -193,32 +461,14 @@ class DatabaseService:
     
     def _list_resumes_postgres(self) -> List[Dict[str, str]]:
         """List all resumes in PostgreSQL"""
-        conn = None
-        cursor = None
         try:
-            conn = self.get_postgres_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-            
-            cursor.execute(
-                f"""
-                SELECT DISTINCT name, filename
-                FROM {POSTGRES_RESUME_TABLE}
-                ORDER BY name
-                """
-            )
-            
-            results = cursor.fetchall()
-            return [dict(row) for row in results]
+            with self.connection() as conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                cursor.execute(_LIST_RESUMES_SQL)
+                
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"❌ Error listing resumes from PostgreSQL: {str(e)}")
-            if conn:
-                conn.rollback()
             return []
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
     
     def count_resumes(self) -> int:
         """Count the number of unique resumes in the database"""
@@ -226,85 +476,68 @@ class DatabaseService:
     
     def _count_resumes_postgres(self) -> int:
         """Count the number of unique resumes in PostgreSQL"""
-        conn = None
-        cursor = None
         try:
-            conn = self.get_postgres_connection()
-            cursor = conn.cursor()
-            
-            # First check if table exists
-            cursor.execute("SELECT to_regclass('public.resumes')")
-            table_exists = cursor.fetchone()[0]
-            
-            if not table_exists:
-                logger.warning(f"❌ Table {POSTGRES_RESUME_TABLE} does not exist")
-                return 0
-            
-            # Make sure to use the table name from config
-            cursor.execute(
-                f"""
-                SELECT COUNT(DISTINCT name)
-                FROM {POSTGRES_RESUME_TABLE}
-                """
-            )
-            
-            count = cursor.fetchone()[0]
-            logger.info(f"Found {count} unique resumes in PostgreSQL")
-            return count
+            with self.connection() as conn, conn.cursor() as cursor:
+                # First check if table exists
+                if not self._ensure_table(cursor):
+                    logger.warning(f"❌ Table {POSTGRES_RESUME_TABLE} does not exist")
+                    return 0
+                
+                # Count candidates from the metadata table instead of every chunk
+                cursor.execute(_COUNT_RESUMES_SQL)
+                
+                count = cursor.fetchone()[0]
+                logger.info(f"Found {count} unique resumes in PostgreSQL")
+                return count
         except Exception as e:
             logger.error(f"❌ Error counting resumes in PostgreSQL: {str(e)}")
-            if conn:
-                conn.rollback()
             return 0
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
     
     def get_connection_status(self) -> Dict[str, bool]:
         """
-        Test the connection to the database
+        Test the connection to the database, reusing a check from the last
+        few seconds
         
         Returns:
             Dictionary with status of the database connection
         """
+        if self._status_cache is not None:
+            timestamp, status = self._status_cache
+            if time.time() - timestamp < STATUS_CACHE_TTL_SECONDS:
+                return dict(status)
+        
         status = {
             "postgres": False
         }
         
-        # Test PostgreSQL connection
-        conn = None
-        cursor = None
+        # Test PostgreSQL connection; once the table is known to exist this is
+        # a single query, which both proves the connection and reads the table
         try:
-            conn = self.get_postgres_connection()
-            cursor = conn.cursor()
-            
-            # Check if the resumes table exists - use table name from config
-            cursor.execute(f"SELECT to_regclass('public.{POSTGRES_RESUME_TABLE}')")
-            table_exists = cursor.fetchone()[0]
-            
-            if table_exists:
-                # Test a simple query with explicit table name from config
-                cursor.execute(f"SELECT COUNT(*) FROM {POSTGRES_RESUME_TABLE}")
-                cursor.fetchone()
-                status["postgres"] = True
-                logger.info(f"PostgreSQL connection successful and '{POSTGRES_RESUME_TABLE}' table exists")
-            else:
-                # Database works but table doesn't exist
-                status["postgres"] = True
-                logger.warning(f"PostgreSQL connection works but '{POSTGRES_RESUME_TABLE}' table not found")
+            with self.connection() as conn, conn.cursor() as cursor:
+                # Check if the resumes table exists - use table name from config
+                if self._ensure_table(cursor):
+                    # Test a simple query with explicit table name from config; reading
+                    # one row proves access without counting the whole table
+                    cursor.execute(_PROBE_RESUMES_SQL)
+                    cursor.fetchone()
+                    status["postgres"] = True
+                    logger.info(f"PostgreSQL connection successful and '{POSTGRES_RESUME_TABLE}' table exists")
+                else:
+                    # Database works but table doesn't exist
+                    status["postgres"] = True
+                    logger.warning(f"PostgreSQL connection works but '{POSTGRES_RESUME_TABLE}' table not found")
         except Exception as e:
             logger.warning(f"PostgreSQL connection test failed: {str(e)}")
-            if conn:
-                conn.rollback()  # Important: rollback on exception
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
         
-        return status
+        self._status_cache = (time.time(), status)
+        return dict(status)
 
-# Create a global instance
-db_service = DatabaseService()
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_db_service() -> DatabaseService:
+    """
+    Get the shared database service, creating it on first use
+    
+    Importing this module doesn't construct the service, so nothing runs
+    against the database before the application has started.
+    """
+    return DatabaseService()
\ No newline at end of file
@@ -6,18 +6,202 @@ different email providers (SMTP, Gmail, MailerSend) and allowing for digest emai
 to be sent after processing.
 """
 
+import asyncio
+import io
+import json
 import logging
-import smtplib
-import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Optional, Any, Union
+import threading
+from collections import ChainMap, deque
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Tuple
 from datetime import datetime
+from html import escape
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard json module
+    orjson = None
+
+# requests is only needed for the MailerSend provider
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+# smtplib, ssl and the MIME classes are imported where they are used, so
+# MailerSend deployments never load them
+if TYPE_CHECKING:
+    from email.mime.multipart import MIMEMultipart
 
 from app.config import email_config, EMAIL_ENABLED, FRONTEND_URL
 
 logger = logging.getLogger(__name__)
 
+# Digest email HTML, split around the per-vacancy rows. The pieces are built
+# once here; the head has no placeholders, so its CSS needs no brace escaping.
+DIGEST_HTML_HEAD = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                h1, h2, h3 { color: #2c3e50; }
+                .container { max-width: 800px; margin: 0 auto; }
+                table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                th { background-color: #f2f2f2; }
+                tr:nth-child(even) { background-color: #f9f9f9; }
+                .stats { background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
+                .highlight { color: #2980b9; font-weight: bold; }
+                .reject { color: #e74c3c; }
+                .match { color: #27ae60; }
+            </style>
+        </head>"""
+DIGEST_HTML_INTRO = """
+        <body>
+            <div class="container">
+                <h1>ResumeAI Processing Results</h1>
+                <p>The ResumeAI system has found {count} open vacancies with potential matches.</p>
+                
+                <div class="stats">
+                    <h2>Processing Statistics</h2>
+                    <p>Total time: <span class="highlight">{total_time}</span></p>
+                    <p>Token usage: <span class="highlight">{token_usage}</span></p>
+                </div>
+                
+                <h2>Processed Vacancies</h2>
+                <table>
+                    <tr>
+                        <th>Vacancy</th>
+                        <th>Client</th>
+                        <th>Status</th>
+                        <th>Top Match</th>
+                        <th>Checked Resumes</th>
+                        <th>Spinweb Link</th>
+                        <th>Details</th>
+                    </tr>
+        """
+DIGEST_HTML_ROW = """
+                <tr>
+                    <td>{functie}</td>
+                    <td>{klant}</td>
+                    <td class="{status_class}">{status}</td>
+                    <td>{top_match}</td>
+                    <td>{resumes}</td>
+                    <td><a href="{spinweb_link}" target="_blank" style="display:inline-block; padding:4px 8px; background-color:#3498db; color:white; border-radius:4px; text-decoration:none; font-size:12px;">Spinweb</a></td>
+                    <td><a href="{detail_link}" target="_blank" style="display:inline-block; padding:4px 8px; background-color:#2ecc71; color:white; border-radius:4px; text-decoration:none; font-size:12px;">Details</a></td>
+                </tr>
+            """
+DIGEST_HTML_FOOTER = """
+                </table>
+                
+                <p>This is an automated email from the ResumeAI system.</p>
+            </div>
+        </body>
+        </html>
+        """
+
+# Digest fields as (database name, capitalized name used by the processing
+# pipeline); each vacancy carries one or the other
+DIGEST_FIELDS = (
+    ("functie", "Functie"),
+    ("klant", "Klant"),
+    ("status", "Status"),
+    ("top_match", "Top_Match"),
+    ("checked_resumes", "Checked_resumes"),
+)
+
+# Plain text digest, split around the per-vacancy entries like the HTML one
+DIGEST_TEXT_INTRO = """
+ResumeAI Processing Results
+==========================
+
+The ResumeAI system has found {count} open vacancies with potential matches.
+
+Processing Statistics:
+- Total time: {total_time}
+- Token usage: {token_usage}
+
+Processed Vacancies:
+        """
+DIGEST_TEXT_ROW = """
+- {functie} at {klant}
+  Status: {status}
+  Top Match: {top_match}
+  Checked Resumes: {checked_resumes}
+  Spinweb: {spinweb}
+  Details: {details}
+            """
+DIGEST_TEXT_FOOTER = """
+This is an automated email from the ResumeAI system.
+        """
+
+# Emails kept by the dry-run provider, newest last, for inspection
+DRY_RUN_OUTBOX_SIZE = 1000
+
+# Prefix of the vacancy detail page links in digests, built once
+VACANCY_DETAIL_BASE_URL = f"{FRONTEND_URL.rstrip('/')}/vacancies/"
+
+def _unique_recipients(recipients: List[str]) -> List[str]:
+    """
+    Strip recipient addresses and drop empty and repeated ones, keeping the
+    first spelling of each address (compared case-insensitively) in order,
+    so nobody is sent the same email twice.
+    """
+    unique = {}
+    for recipient in recipients:
+        recipient = recipient.strip()
+        if recipient:
+            unique.setdefault(recipient.lower(), recipient)
+    return list(unique.values())
+
+def _html_text(value: Any) -> str:
+    """
+    Format a value for the digest HTML, escaping markup characters.
+    
+    Numbers can't contain markup, so they skip the escape scan; everything
+    else is escaped in a single html.escape pass.
+    """
+    if isinstance(value, (int, float)):
+        return str(value)
+    return escape(str(value))
+
+# TLS context for STARTTLS, created on the first SMTP connection and reused;
+# creating one loads the system CA certificates from disk
+_ssl_context = None
+
+MAILERSEND_API_URL = "https://api.mailersend.com/v1/email"
+# (connect, read) timeouts for MailerSend API calls, in seconds
+MAILERSEND_TIMEOUT = (3.05, 30)
+
+def _create_mailersend_session():
+    """
+    Create the HTTP session shared by all MailerSend calls, so consecutive
+    emails reuse a kept-alive TLS connection instead of each opening one.
+    
+    Failed connects and rate-limited (429) requests are retried with backoff;
+    other errors aren't, since the email may already have been accepted.
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=[429],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False
+    )
+    session.mount("https://", HTTPAdapter(pool_maxsize=10, max_retries=retries))
+    session.headers.update({
+        "Content-Type": "application/json",
+        "X-Requested-With": "XMLHttpRequest"
+    })
+    return session
+
+_mailersend_session = _create_mailersend_session() if requests is not None else None
+
 
 class EmailService:
     """Service for sending email notifications."""
@@ -26,10 +210,83 @@ class EmailService:
         """Initialize the email service."""
         self.enabled = EMAIL_ENABLED
         self.config = email_config
-        logger.info(f"Email service initialized. Enabled: {self.enabled}")
+        # Authenticated SMTP session reused across sends, so a batch of emails
+        # pays for the connect, STARTTLS and login once. smtplib connections
+        # aren't thread-safe, so the lock covers every use of it.
+        self._smtp = None
+        self._smtp_settings = None
+        self._smtp_lock = threading.Lock()
+        # Parsed configured recipients, with the setting they were parsed from
+        self._recipients_source = None
+        self._recipients: List[str] = []
+        # Emails "sent" with the dryrun provider, which records them here
+        # instead of opening any connection
+        self.dry_run_outbox = deque(maxlen=DRY_RUN_OUTBOX_SIZE)
+        logger.info("Email service initialized. Enabled: %s", self.enabled)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Close the cached SMTP connection and MailerSend HTTP connections, if any."""
+        with self._smtp_lock:
+            self._close_smtp()
+        if _mailersend_session is not None:
+            _mailersend_session.close()
+
+    def _default_recipients(self) -> List[str]:
+        """Get the configured recipients as a list, parsing the setting only when it changes."""
+        if self.config.recipients != self._recipients_source:
+            self._recipients = _unique_recipients((self.config.recipients or "").split(','))
+            self._recipients_source = self.config.recipients
+        return list(self._recipients)
+
+    def _smtp_connection_settings(self) -> tuple:
+        """Settings the cached SMTP connection was made with; a change means reconnecting."""
+        return (
+            self.config.provider, self.config.smtp_host, self.config.smtp_port,
+            self.config.smtp_use_tls, self.config.username, self.config.password
+        )
+
+    def _close_smtp(self) -> None:
+        """Close the cached SMTP connection. Call with the SMTP lock held."""
+        if self._smtp is None:
+            return
+        import smtplib
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            # The server already dropped it; just release the socket
+            self._smtp.close()
+        self._smtp = None
+        self._smtp_settings = None
+
+    def _get_smtp(self):
+        """
+        Get the cached SMTP connection, checking it with NOOP and reconnecting
+        if it was dropped or the settings changed. Call with the SMTP lock held.
+        """
+        import smtplib
+        settings = self._smtp_connection_settings()
+        if self._smtp is not None and self._smtp_settings == settings:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._close_smtp()
+        self._smtp = self._create_smtp_connection()
+        self._smtp_settings = settings
+        return self._smtp
 
     def _create_smtp_connection(self):
         """Create an SMTP connection based on the current configuration."""
+        import smtplib
+        import ssl
+        
         if self.config.provider == "gmail":
             smtp_host = "smtp.gmail.com"
             smtp_port = 587
@@ -43,8 +300,10 @@ class EmailService:
             
             # Use TLS if configured
             if self.config.smtp_use_tls:
-                context = ssl.create_default_context()
-                connection.starttls(context=context)
+                global _ssl_context
+                if _ssl_context is None:
+                    _ssl_context = ssl.create_default_context()
+                connection.starttls(context=_ssl_context)
             
             # Login if credentials are provided
             if self.config.username and self.config.password:
@@ -52,7 +311,7 @@ class EmailService:
             
             return connection
         except Exception as e:
-            logger.error(f"Failed to create SMTP connection: {str(e)}")
+            logger.error("Failed to create SMTP connection: %s", e)
             raise
 
     def send_email(self, subject: str, recipients: Optional[List[str]] = None, 
@@ -83,76 +342,172 @@ class EmailService:
             
         # Use configuration recipients if none provided
         if not recipients:
-            recipients = [email.strip() for email in self.config.recipients.split(',') if email.strip()]
+            recipients = self._default_recipients()
+        else:
+            recipients = _unique_recipients(recipients)
             
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.config.from_name} <{self.config.from_email}>"
-            msg['To'] = ", ".join(recipients)
-            
-            # Add text and HTML parts
-            if text_content:
-                msg.attach(MIMEText(text_content, 'plain'))
-            if html_content:
-                msg.attach(MIMEText(html_content, 'html'))
-                
             # Send email based on provider
             if self.config.provider == "mailersend":
-                self._send_mailersend(msg, recipients)
+                self._send_mailersend(subject, recipients, html_content, text_content)
+            elif self.config.provider == "dryrun":
+                self._send_dry_run(subject, recipients, html_content, text_content)
             else:  # smtp or gmail
-                self._send_smtp(msg, recipients)
+                self._send_smtp(self._create_mime_message(subject, recipients, html_content, text_content),
+                                recipients)
                 
-            logger.info(f"Email sent successfully to {len(recipients)} recipients")
+            logger.info("Email sent successfully to %d recipients", len(recipients))
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email: {str(e)}")
+            logger.error("Failed to send email: %s", e)
             return False
             
-    def _send_smtp(self, msg: MIMEMultipart, recipients: List[str]) -> None:
-        """Send email using SMTP."""
-        with self._create_smtp_connection() as connection:
-            connection.send_message(msg)
+    async def send_email_async(self, subject: str, recipients: Optional[List[str]] = None,
+                               html_content: str = "", text_content: str = "") -> bool:
+        """
+        Send an email without blocking the event loop.
+        
+        Runs send_email in a worker thread, for callers inside a coroutine,
+        where the SMTP session or MailerSend request would otherwise stall
+        every other task on the loop until it completes.
+        """
+        return await asyncio.to_thread(self.send_email, subject, recipients, html_content, text_content)
+
+    def send_batch(self, messages: List[Tuple[str, Optional[List[str]], str, str]]) -> int:
+        """
+        Send several emails over one connection.
+        
+        For SMTP the connection is checked once and held for the whole batch,
+        instead of being locked and checked with NOOP for every email; for
+        MailerSend the requests share the kept-alive HTTP session.
+        
+        Args:
+            messages: (subject, recipients, html_content, text_content) tuples;
+                recipients may be None to use the configured recipients
+            
+        Returns:
+            int: Number of emails sent successfully
+        """
+        if not self.enabled:
+            logger.info("Email service is disabled. Not sending emails.")
+            return 0
+        
+        sent = 0
+        if self.config.provider in ("mailersend", "dryrun"):
+            send = self._send_mailersend if self.config.provider == "mailersend" else self._send_dry_run
+            for subject, recipients, html_content, text_content in messages:
+                recipients = _unique_recipients(recipients) if recipients else self._default_recipients()
+                try:
+                    send(subject, recipients, html_content, text_content)
+                    sent += 1
+                except Exception as e:
+                    logger.error("Failed to send email: %s", e)
+        else:  # smtp or gmail
+            import smtplib
+            with self._smtp_lock:
+                checked = False
+                for subject, recipients, html_content, text_content in messages:
+                    recipients = _unique_recipients(recipients) if recipients else self._default_recipients()
+                    try:
+                        msg = self._create_mime_message(subject, recipients, html_content, text_content)
+                        # Only the first email checks the connection; a drop later
+                        # in the batch reconnects and retries that email once
+                        if not checked or self._smtp is None:
+                            self._get_smtp()
+                            checked = True
+                        try:
+                            self._smtp.send_message(msg)
+                        except smtplib.SMTPServerDisconnected:
+                            self._close_smtp()
+                            self._get_smtp().send_message(msg)
+                        sent += 1
+                    except Exception as e:
+                        logger.error("Failed to send email: %s", e)
+        
+        logger.info("Sent %d of %d emails", sent, len(messages))
+        return sent
+            
+    def _send_dry_run(self, subject: str, recipients: List[str],
+                      html_content: str, text_content: str) -> None:
+        """Record an email in the dry-run outbox instead of sending it."""
+        self.dry_run_outbox.append({
+            "subject": subject,
+            "recipients": recipients,
+            "html": html_content,
+            "text": text_content
+        })
+        logger.info("Dry run: recorded email %r to %d recipients", subject, len(recipients))
+
+    def _create_mime_message(self, subject: str, recipients: List[str],
+                             html_content: str, text_content: str) -> "MIMEMultipart":
+        """Create the MIME message sent over SMTP."""
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.config.from_name} <{self.config.from_email}>"
+        msg['To'] = ", ".join(recipients)
+        
+        # Add text and HTML parts
+        if text_content:
+            msg.attach(MIMEText(text_content, 'plain'))
+        if html_content:
+            msg.attach(MIMEText(html_content, 'html'))
+        
+        return msg
+            
+    def _send_smtp(self, msg: "MIMEMultipart", recipients: List[str]) -> None:
+        """Send email using SMTP, over the cached connection."""
+        import smtplib
+        with self._smtp_lock:
+            try:
+                self._get_smtp().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between the NOOP check and the send; retry once on a new connection
+                self._close_smtp()
+                self._get_smtp().send_message(msg)
             
-    def _send_mailersend(self, msg: MIMEMultipart, recipients: List[str]) -> None:
-        """Send email using MailerSend API."""
+    def _send_mailersend(self, subject: str, recipients: List[str],
+                         html_content: str, text_content: str) -> None:
+        """Send email using MailerSend API, which takes the content as plain strings."""
         try:
-            # Import inside the method to avoid dependency requirements for those not using MailerSend
-            import requests
+            if _mailersend_session is None:
+                raise ImportError("requests is not installed")
             
             # Check if we have an API key (stored in username for MailerSend)
             if not self.config.username:
                 raise Exception("MailerSend API key is required (set in the Username field)")
             
-            # Convert MIME message to MailerSend API format
+            # Build the MailerSend API request
             data = {
                 "from": {"email": self.config.from_email, "name": self.config.from_name},
                 "to": [{"email": recipient} for recipient in recipients],
-                "subject": msg["Subject"],
+                "subject": subject,
             }
             
             # Add text and HTML content
-            for part in msg.get_payload():
-                if part.get_content_type() == "text/plain":
-                    data["text"] = part.get_payload(decode=True).decode()
-                elif part.get_content_type() == "text/html":
-                    data["html"] = part.get_payload(decode=True).decode()
+            if text_content:
+                data["text"] = text_content
+            if html_content:
+                data["html"] = html_content
             
-            # Send request to MailerSend API
-            response = requests.post(
-                "https://api.mailersend.com/v1/email",
-                json=data,
+            # Send request to MailerSend API over the shared session
+            # Encode the request body ourselves (the session sets the JSON
+            # content type), with orjson when it is installed
+            body = orjson.dumps(data) if orjson is not None else json.dumps(data).encode()
+            response = _mailersend_session.post(
+                MAILERSEND_API_URL,
+                data=body,
                 headers={
-                    "Content-Type": "application/json",
-                    "X-Requested-With": "XMLHttpRequest", 
                     "Authorization": f"Bearer {self.config.username}"  # Use username field for API key
-                }
+                },
+                timeout=MAILERSEND_TIMEOUT
             )
             
             # Log detailed information for debugging
-            logger.info(f"MailerSend API response: {response.status_code}")
+            logger.info("MailerSend API response: %s", response.status_code)
             
             if response.status_code >= 400:
                 raise Exception(f"MailerSend API error: {response.status_code} - {response.text}")
@@ -161,7 +516,7 @@ class EmailService:
             logger.error("Requests library not installed. Cannot use MailerSend provider.")
             raise
         except Exception as e:
-            logger.error(f"Failed to send email via MailerSend: {str(e)}")
+            logger.error("Failed to send email via MailerSend: %s", e)
             raise
             
     def send_digest(self, processed_vacancies: List[Dict[str, Any]], 
@@ -179,18 +534,25 @@ class EmailService:
         if not self.enabled or not processed_vacancies:
             return False
         
-        # Filter to only include Open vacancies
-        open_vacancies = []
-        for vacancy in processed_vacancies:
+        # Filter to only include Open vacancies, before any other work on them
+        open_vacancies = [
+            vacancy for vacancy in processed_vacancies
             # Check for status in both lowercase and uppercase format
-            status = vacancy.get("status") or vacancy.get("Status", "")
-            if status == "Open":
-                open_vacancies.append(vacancy)
+            if (vacancy.get("status") or vacancy.get("Status", "")) == "Open"
+        ]
         
         # Only proceed if there are open vacancies to report
         if not open_vacancies:
             logger.info("No open vacancies to include in digest email. Not sending.")
             return False
+        
+        # Digests go to the configured recipients; without any, don't build one
+        if not self.config.recipients:
+            logger.warning("No recipients specified. Not sending email.")
+            return False
+        
+        # Normalize the open vacancies once for both renderers
+        open_vacancies = self._normalize_vacancies(open_vacancies)
             
         # Create subject with count of open vacancies
         now = datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -203,145 +565,134 @@ class EmailService:
         # Send email
         return self.send_email(subject, html_content=html_content, text_content=text_content)
         
-    def _create_digest_html(self, processed_vacancies: List[Dict[str, Any]], 
-                          processing_stats: Dict[str, Any]) -> str:
-        """Create HTML content for digest email."""
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                h1, h2, h3 {{ color: #2c3e50; }}
-                .container {{ max-width: 800px; margin: 0 auto; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-                tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                .stats {{ background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-                .highlight {{ color: #2980b9; font-weight: bold; }}
-                .reject {{ color: #e74c3c; }}
-                .match {{ color: #27ae60; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>ResumeAI Processing Results</h1>
-                <p>The ResumeAI system has found {len(processed_vacancies)} open vacancies with potential matches.</p>
-                
-                <div class="stats">
-                    <h2>Processing Statistics</h2>
-                    <p>Total time: <span class="highlight">{processing_stats.get('total_time', 'N/A')}</span></p>
-                    <p>Token usage: <span class="highlight">{processing_stats.get('token_usage', 'N/A')}</span></p>
-                </div>
-                
-                <h2>Processed Vacancies</h2>
-                <table>
-                    <tr>
-                        <th>Vacancy</th>
-                        <th>Client</th>
-                        <th>Status</th>
-                        <th>Top Match</th>
-                        <th>Checked Resumes</th>
-                        <th>Spinweb Link</th>
-                        <th>Details</th>
-                    </tr>
+    async def send_digest_async(self, processed_vacancies: List[Dict[str, Any]],
+                                processing_stats: Dict[str, Any]) -> bool:
+        """Send a digest email with processing results without blocking the event loop."""
+        return await asyncio.to_thread(self.send_digest, processed_vacancies, processing_stats)
+        
+    def _normalize_vacancies(self, vacancies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
+        Resolve the digest fields of each vacancy once, for both the HTML and
+        the text digest.
         
-        # Add rows for each vacancy
-        for vacancy in processed_vacancies:
-            # Get status in a case-insensitive way since database columns might vary
-            status = vacancy.get("status") or vacancy.get("Status", "N/A")
-            status_class = "match" if status == "Open" else "reject"
-            
-            # Get values with fallbacks for different field name variations
-            functie = vacancy.get('functie') or vacancy.get('Functie', 'N/A')
-            klant = vacancy.get('klant') or vacancy.get('Klant', 'N/A')
-            top_match = vacancy.get('top_match') or vacancy.get('Top_Match', 'N/A')
-            resumes = vacancy.get('checked_resumes') or vacancy.get('Checked_resumes', 'N/A')
+        Vacancies come with lowercase (database) or capitalized field names;
+        the rows returned always use the lowercase ones, plus spinweb_link and
+        detail_link (None when the vacancy has no URL or ID).
+        """
+        rows = []
+        for vacancy in vacancies:
+            row = {}
+            for field, alternative in DIGEST_FIELDS:
+                # The capitalized name is only looked up when the lowercase one
+                # is absent; a value that is merely falsy (such as a top match
+                # of 0) is kept rather than replaced
+                value = vacancy.get(field)
+                if value is None:
+                    value = vacancy.get(alternative)
+                row[field] = "N/A" if value is None or value == "" else value
             
             # Get URL and ID for links
             url = vacancy.get('url') or vacancy.get('Url', '')
             vacancy_id = vacancy.get('id', '') # Database ID for the details page
+            row["spinweb_link"] = f"https://{url}" if url else None
+            row["detail_link"] = f"{VACANCY_DETAIL_BASE_URL}{vacancy_id}" if vacancy_id else None
+            rows.append(row)
+        return rows
+        
+    def _create_digest_html(self, processed_vacancies: List[Dict[str, Any]], 
+                          processing_stats: Dict[str, Any]) -> str:
+        """Create HTML content for digest email from normalized vacancies."""
+        # Collect the pieces and join them once, instead of growing a string per row
+        html_parts = [DIGEST_HTML_HEAD, DIGEST_HTML_INTRO.format(
+            count=len(processed_vacancies),
+            total_time=_html_text(processing_stats.get('total_time', 'N/A')),
+            token_usage=_html_text(processing_stats.get('token_usage', 'N/A'))
+        )]
+        
+        # Add rows for each vacancy
+        for vacancy in processed_vacancies:
+            status = vacancy["status"]
             
-            # Create links with styling
-            spinweb_link = f"https://{url}" if url else "#"
-            detail_link = f"{FRONTEND_URL}/vacancies/{vacancy_id}" if vacancy_id else "#"
-            
-            # Create styled link buttons
-            spinweb_button = f'<a href="{spinweb_link}" target="_blank" style="display:inline-block; padding:4px 8px; background-color:#3498db; color:white; border-radius:4px; text-decoration:none; font-size:12px;">Spinweb</a>'
-            detail_button = f'<a href="{detail_link}" target="_blank" style="display:inline-block; padding:4px 8px; background-color:#2ecc71; color:white; border-radius:4px; text-decoration:none; font-size:12px;">Details</a>'
-            
-            html += f"""
-                <tr>
-                    <td>{functie}</td>
-                    <td>{klant}</td>
-                    <td class="{status_class}">{status}</td>
-                    <td>{top_match}</td>
-                    <td>{resumes}</td>
-                    <td>{spinweb_button}</td>
-                    <td>{detail_button}</td>
-                </tr>
-            """
+            # Scraped text is escaped so it can't inject markup into the email
+            html_parts.append(DIGEST_HTML_ROW.format(
+                functie=_html_text(vacancy["functie"]),
+                klant=_html_text(vacancy["klant"]),
+                status_class="match" if status == "Open" else "reject",
+                status=_html_text(status),
+                top_match=_html_text(vacancy["top_match"]),
+                resumes=_html_text(vacancy["checked_resumes"]),
+                spinweb_link=_html_text(vacancy["spinweb_link"] or "#"),
+                detail_link=_html_text(vacancy["detail_link"] or "#")
+            ))
         
-        html += """
-                </table>
-                
-                <p>This is an automated email from the ResumeAI system.</p>
-            </div>
-        </body>
-        </html>
-        """
+        html_parts.append(DIGEST_HTML_FOOTER)
         
-        return html
+        return "".join(html_parts)
         
     def _create_digest_text(self, processed_vacancies: List[Dict[str, Any]], 
                            processing_stats: Dict[str, Any]) -> str:
-        """Create plain text content for digest email."""
-        text = f"""
-ResumeAI Processing Results
-==========================
-
-The ResumeAI system has found {len(processed_vacancies)} open vacancies with potential matches.
-
-Processing Statistics:
-- Total time: {processing_stats.get('total_time', 'N/A')}
-- Token usage: {processing_stats.get('token_usage', 'N/A')}
-
-Processed Vacancies:
-        """
+        """Create plain text content for digest email from normalized vacancies."""
+        # Write into one buffer instead of building a string per vacancy
+        buf = io.StringIO()
+        buf.write(DIGEST_TEXT_INTRO.format(
+            count=len(processed_vacancies),
+            total_time=processing_stats.get('total_time', 'N/A'),
+            token_usage=processing_stats.get('token_usage', 'N/A')
+        ))
         
-        # Add info for each vacancy
+        # Add info for each vacancy; the normalized row supplies the fields
+        # directly, only the missing links are filled in on top of it
         for vacancy in processed_vacancies:
-            # Get values with fallbacks for different field name variations
-            functie = vacancy.get('functie') or vacancy.get('Functie', 'N/A')
-            klant = vacancy.get('klant') or vacancy.get('Klant', 'N/A')
-            status = vacancy.get("status") or vacancy.get("Status", "N/A")
-            top_match = vacancy.get('top_match') or vacancy.get('Top_Match', 'N/A')
-            resumes = vacancy.get('checked_resumes') or vacancy.get('Checked_resumes', 'N/A')
-            
-            # Get URL and ID for links
-            url = vacancy.get('url') or vacancy.get('Url', '')
-            vacancy_id = vacancy.get('id', '') # Database ID for the details page
-            
-            # Create links for text version
-            spinweb_link = f"https://{url}" if url else "N/A"
-            detail_link = f"{FRONTEND_URL}/vacancies/{vacancy_id}" if vacancy_id else "N/A"
-            
-            text += f"""
-- {functie} at {klant}
-  Status: {status}
-  Top Match: {top_match}
-  Checked Resumes: {resumes}
-  Spinweb: {spinweb_link}
-  Details: {detail_link}
-            """
+            links = {
+                "spinweb": vacancy["spinweb_link"] or "N/A",
+                "details": vacancy["detail_link"] or "N/A",
+            }
+            buf.write(DIGEST_TEXT_ROW.format_map(ChainMap(links, vacancy)))
         
-        text += """
-This is an automated email from the ResumeAI system.
-        """
+        buf.write(DIGEST_TEXT_FOOTER)
         
-        return text
+        return buf.getvalue()
+
+
+class _NullEmailService:
+    """
+    Stand-in for EmailService when email is disabled.
+    
+    It has the same interface, but sends nothing and never opens an SMTP or
+    MailerSend connection.
+    """
+
+    enabled = False
+
+    def __init__(self):
+        self.config = email_config
+        logger.info("Email service is disabled. Emails will not be sent.")
+
+    def send_email(self, subject: str, recipients: Optional[List[str]] = None,
+                   html_content: str = "", text_content: str = "") -> bool:
+        logger.info("Email service is disabled. Not sending email.")
+        return False
+
+    async def send_email_async(self, subject: str, recipients: Optional[List[str]] = None,
+                               html_content: str = "", text_content: str = "") -> bool:
+        return self.send_email(subject, recipients, html_content, text_content)
+
+    def send_batch(self, messages: List[Tuple[str, Optional[List[str]], str, str]]) -> int:
+        logger.info("Email service is disabled. Not sending emails.")
+        return 0
+
+    def send_digest(self, processed_vacancies: List[Dict[str, Any]],
+                    processing_stats: Dict[str, Any]) -> bool:
+        return False
+
+    async def send_digest_async(self, processed_vacancies: List[Dict[str, Any]],
+                                processing_stats: Dict[str, Any]) -> bool:
+        return False
+
+    def close(self) -> None:
+        pass
 
 
-# Create a global instance of the service
-email_service = EmailService()
\ No newline at end of file
+# Create a global instance of the service; EMAIL_ENABLED is read at startup,
+# so a disabled deployment gets the no-op service
+email_service = EmailService() if EMAIL_ENABLED else _NullEmailService()
\ No newline at end of file
@@ -14,6 +14,7 @@ Repository: https://github.com/DanielTromp/ResumeAI
 """
 
 import os
+import asyncio
 import base64
 import secrets
 import time
@@ -21,9 +22,12 @@ import shutil
 from fastapi import FastAPI, Depends, Request, HTTPException, status
 from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from anyio import to_thread
 from dotenv import load_dotenv
 
 # Import routers
@@ -33,14 +37,26 @@ from app.routers import vacancies, resumes, settings, process, tasks, statistics
 from app.db_init import initialize_database, get_connection
 
 # Import database utilities
-from app.db_interfaces.postgres import rebuild_vacancy_statistics
+from app.db_interfaces.postgres import rebuild_vacancy_statistics, close_pool
+
+# Import services with connections to close on shutdown
+from app.services.email_service import email_service
 
 # Scheduler service has been removed
 # from app.services.scheduler_service import scheduler_service
 
+# Worker threads for blocking calls (run_in_threadpool and asyncio.to_thread).
+# anyio defaults to 40, which queues concurrent requests behind each other
+# while they wait on synchronous database calls.
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "80"))
+
 # Create startup and shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Size the worker thread pools before any blocking work is dispatched
+    to_thread.current_default_thread_limiter().total_tokens = THREAD_POOL_SIZE
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE))
+    
     # Initialize PostgreSQL database with pgvector
     try:
         initialize_database()
@@ -60,9 +76,25 @@ async def lifespan(app: FastAPI):
     # Scheduler has been removed
     print("ℹ️ Scheduler has been removed. Use system cron instead.")
     
+    # Keep the vacancies list cache warm in the background
+    cache_refresh_task = asyncio.create_task(vacancies.vacancy_cache_refresh_loop())
+    
     print("✅ Application started successfully")
     yield
     
+    # Stop the background cache refresh
+    cache_refresh_task.cancel()
+    try:
+        await cache_refresh_task
+    except asyncio.CancelledError:
+        pass
+    
+    # Close the pooled database connections
+    close_pool()
+    
+    # Close the cached SMTP connection
+    email_service.close()
+    
     # No scheduler to clean up
     
     print("✅ Application shutdown completed")
@@ -177,6 +209,9 @@ app.add_middleware(
     max_age=60 * 60  # Cache preflight requests for 1 hour
 )
 
+# Compress larger responses (e.g. vacancy pages with long match explanations)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Prepare frontend static files directory
 FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
 os.makedirs(FRONTEND_DIR, exist_ok=True)
@@ -39,16 +39,21 @@ const Dashboard = () => {
           fullUrl: `${window.location.origin}/api/statistics/vacancies`
         });
         
-        // Fetch vacancy statistics - this is more efficient than multiple API calls
-        console.log('Making vacancy stats request...');
-        let statsResponse;
-        try {
-          statsResponse = await getVacancyStats();
-          console.log('Vacancy stats request successful');
-        } catch (vacancyError) {
-          console.error('Vacancy stats request failed:', vacancyError);
-          throw new Error(`Vacancy stats request failed: ${vacancyError.message}`);
+        // Fetch vacancy statistics - this is more efficient than multiple API calls.
+        // The resumes request is independent, so both are sent at once and the
+        // dashboard waits for the slower of the two instead of their sum.
+        console.log('Making vacancy stats and resumes requests...');
+        const [statsResult, resumesResult] = await Promise.allSettled([
+          getVacancyStats(),
+          getResumes({ limit: 1 })
+        ]);
+        
+        if (statsResult.status === 'rejected') {
+          console.error('Vacancy stats request failed:', statsResult.reason);
+          throw new Error(`Vacancy stats request failed: ${statsResult.reason.message}`);
         }
+        const statsResponse = statsResult.value;
+        console.log('Vacancy stats request successful');
         
         console.log('Statistics response received:', statsResponse.data);
         
@@ -62,16 +67,12 @@ const Dashboard = () => {
         const openVacanciesCount = vacancyStats.Open || 0;
         const newVacanciesCount = vacancyStats.Nieuw || 0;
         
-        // Fetch resumes stats
-        console.log('Making resumes request...');
-        let resumesResponse;
-        try {
-          resumesResponse = await getResumes({ limit: 1 });
-          console.log('Resumes request successful');
-        } catch (resumesError) {
-          console.error('Resumes request failed:', resumesError);
-          throw new Error(`Resumes request failed: ${resumesError.message}`);
+        if (resumesResult.status === 'rejected') {
+          console.error('Resumes request failed:', resumesResult.reason);
+          throw new Error(`Resumes request failed: ${resumesResult.reason.message}`);
         }
+        const resumesResponse = resumesResult.value;
+        console.log('Resumes request successful');
         
         console.log('Setting dashboard stats with data:', {
           totalVacancies: totalAllVacancies,
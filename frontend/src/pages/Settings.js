@@ -419,6 +419,7 @@ const Settings = () => {
                   <option value="smtp">SMTP</option>
                   <option value="gmail">Gmail</option>
                   <option value="mailersend">MailerSend</option>
+                  <option value="dryrun">Dry run (don't send)</option>
                 </TextField>
               </Grid>
 
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link as RouterLink, useSearchParams, useLocation } from 'react-router-dom';
 import {
   Container,
@@ -47,6 +47,8 @@ const VacanciesList = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [statusFilter, setStatusFilter] = useState(initialStatus);
   const [totalVacancies, setTotalVacancies] = useState(0);
+  // Keyset cursors by page index, so paging forward doesn't make the backend scan skipped rows
+  const pageCursors = useRef({});
   const [sortBy, setSortBy] = useState('Geplaatst');
   const [sortDirection, setSortDirection] = useState('desc');
   const [columnFilters, setColumnFilters] = useState({
@@ -90,10 +92,16 @@ const VacanciesList = () => {
       setLoading(true);
       // Prepare query parameters
       const params = {
-        skip: page * rowsPerPage,
         limit: rowsPerPage
       };
       
+      const cursor = pageCursors.current[page];
+      if (cursor) {
+        params.cursor = cursor;
+      } else {
+        params.skip = page * rowsPerPage;
+      }
+      
       if (statusFilter) {
         params.status = statusFilter;
       }
@@ -104,6 +112,7 @@ const VacanciesList = () => {
       console.log(`Received ${response.data.items.length} vacancies with total ${response.data.total}`);
       setVacancies(response.data.items);
       setTotalVacancies(response.data.total);
+      pageCursors.current[page + 1] = response.data.next_cursor;
       setLoading(false);
     } catch (err) {
       console.error('Error fetching vacancies:', err);
@@ -155,11 +164,13 @@ const VacanciesList = () => {
   };
 
   const handleChangeRowsPerPage = (event) => {
+    pageCursors.current = {};
     setRowsPerPage(parseInt(event.target.value, 10));
     setPage(0);
   };
 
   const handleStatusFilterChange = (event) => {
+    pageCursors.current = {};
     setStatusFilter(event.target.value);
     setPage(0); // Reset to first page when filter changes
   };
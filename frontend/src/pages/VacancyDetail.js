@@ -26,6 +26,19 @@ import SaveIcon from '@mui/icons-material/Save';
 import DeleteIcon from '@mui/icons-material/Delete';
 import { getVacancyById, updateVacancy, deleteVacancy } from '../utils/api';
 
+// Whether text can hold (possibly double-encoded) JSON, judged by its first
+// non-whitespace character. Plain text is far more common, and skipping
+// JSON.parse for it avoids throwing and catching an exception on every render.
+const looksLikeJson = (text) => {
+  for (let i = 0; i < text.length; i++) {
+    const ch = text[i];
+    if (ch !== ' ' && ch !== '\t' && ch !== '\n' && ch !== '\r') {
+      return ch === '{' || ch === '[' || ch === '"' || ch === '\\';
+    }
+  }
+  return false;
+};
+
 const VacancyDetail = () => {
   const { id } = useParams();
   const navigate = useNavigate();
@@ -191,20 +204,25 @@ const VacancyDetail = () => {
       // Try to parse the match details as JSON
       if (typeof vacancy.Match_Toelichting === 'string') {
         console.log("String format detected, length:", vacancy.Match_Toelichting.length);
-        try {
-          matchDetails = JSON.parse(vacancy.Match_Toelichting);
-          console.log('Successfully parsed match details as JSON:', matchDetails);
-        } catch (jsonError) {
-          console.error('Failed to parse match details as JSON:', jsonError);
-          // If not valid JSON, check if it might be a stringified JSON string (double encoded)
+        if (!looksLikeJson(vacancy.Match_Toelichting)) {
+          // Plain text, use it as is
+          matchDetails = { raw_text: vacancy.Match_Toelichting };
+        } else {
           try {
-            const unescaped = vacancy.Match_Toelichting.replace(/\\"/g, '"');
-            matchDetails = JSON.parse(unescaped);
-            console.log('Successfully parsed double-encoded match details');
-          } catch (doubleJsonError) {
-            console.error('Not a double-encoded JSON either:', doubleJsonError);
-            // If not JSON at all, use the raw text
-            matchDetails = { raw_text: vacancy.Match_Toelichting };
+            matchDetails = JSON.parse(vacancy.Match_Toelichting);
+            console.log('Successfully parsed match details as JSON:', matchDetails);
+          } catch (jsonError) {
+            console.error('Failed to parse match details as JSON:', jsonError);
+            // If not valid JSON, check if it might be a stringified JSON string (double encoded)
+            try {
+              const unescaped = vacancy.Match_Toelichting.replace(/\\"/g, '"');
+              matchDetails = JSON.parse(unescaped);
+              console.log('Successfully parsed double-encoded match details');
+            } catch (doubleJsonError) {
+              console.error('Not a double-encoded JSON either:', doubleJsonError);
+              // If not JSON at all, use the raw text
+              matchDetails = { raw_text: vacancy.Match_Toelichting };
+            }
           }
         }
       } else if (typeof vacancy.Match_Toelichting === 'object') {
@@ -298,6 +316,9 @@ const VacancyDetail = () => {
 
     // Regular string case
     if (typeof text === 'string') {
+      if (!looksLikeJson(text)) {
+        return formatAsMarkdown(text);
+      }
       try {
         const jsonObject = JSON.parse(text);
         return renderJsonAsHtml(jsonObject);
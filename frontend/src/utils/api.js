@@ -119,11 +119,38 @@ api.interceptors.response.use(
 );
 
 // Vacancies API
-export const getVacancies = (params = {}) => {
-  // Add timestamp to bypass any caching
-  const timestamp = new Date().getTime();
-  params._t = timestamp;
-  return api.get('/api/vacancies', { params });
+
+// Last response per vacancies query, revalidated with its ETag so an unchanged
+// page comes back as an empty 304 instead of the full list
+const vacanciesResponses = new Map();
+const MAX_CACHED_VACANCY_PAGES = 50;
+
+export const getVacancies = async (params = {}) => {
+  const key = JSON.stringify(params);
+  const previous = vacanciesResponses.get(key);
+  
+  const response = await api.get('/api/vacancies', {
+    params,
+    headers: previous ? { 'If-None-Match': previous.headers.etag } : {},
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+  });
+  
+  if (response.status === 304 && previous) {
+    console.log('Vacancies not modified, reusing previous response');
+    return previous;
+  }
+  
+  if (response.headers.etag) {
+    vacanciesResponses.delete(key);
+    vacanciesResponses.set(key, response);
+    if (vacanciesResponses.size > MAX_CACHED_VACANCY_PAGES) {
+      vacanciesResponses.delete(vacanciesResponses.keys().next().value);
+    }
+  } else {
+    // Pages the server didn't cache come without an ETag; don't keep revalidating an older copy
+    vacanciesResponses.delete(key);
+  }
+  return response;
 };
 
 export const getVacancyById = (id) => {